@@ -1,11 +1,37 @@
+import asyncio
 from collections.abc import AsyncGenerator
 
+import orjson
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from app.config import settings
 
-engine = create_async_engine(settings.DATABASE_URL, echo=False, pool_size=5)
+def _orjson_serializer(value) -> str:
+    # asyncpg's JSON/JSONB codec takes text
+    return orjson.dumps(value).decode()
+
+
+engine = create_async_engine(
+    settings.DATABASE_URL,
+    echo=False,
+    poolclass=AsyncAdaptedQueuePool,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_pre_ping=True,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    # Reuse server-side prepared statements per connection (SQLAlchemy's asyncpg
+    # adapter cache) and asyncpg's own statement cache
+    connect_args={"prepared_statement_cache_size": 1024, "statement_cache_size": 1024},
+    # Compiled-SQL cache shared across connections (default is 500 entries)
+    query_cache_size=1024,
+    # JSONB columns (snapshot full_state, theme) go through orjson
+    json_serializer=_orjson_serializer,
+    json_deserializer=orjson.loads,
+)
 async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 
@@ -21,3 +47,13 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         except Exception:
             await session.rollback()
             raise
+
+
+async def warm_up_pool() -> None:
+    """Open the pool's base connections up front so early requests skip connect/TLS."""
+
+    async def _ping() -> None:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    await asyncio.gather(*(_ping() for _ in range(engine.pool.size())))
@@ -1,15 +1,25 @@
+import asyncio
+import multiprocessing
 import os
+from concurrent.futures import ProcessPoolExecutor
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 
 from app.config import settings
-from app.database import Base, engine
+from app.database import Base, engine, warm_up_pool
 from app.routers import users, solar_system as solar_system_router, people, tags, snapshots, generation
 from app.routers import websocket as ws_router
+from app.services.video_generator import (
+    DEFAULT_ENCODER,
+    detect_video_encoder,
+    is_ffmpeg_available,
+)
 from app.utils.seed_tags import seed_predefined_tags
+from app.utils.static_files import ImmutableStaticFiles
 
 
 @asynccontextmanager
@@ -20,17 +30,44 @@ async def lifespan(app: FastAPI):
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
 
+    # Open pooled connections before the first request arrives
+    await warm_up_pool()
+
     # Seed predefined tags
     await seed_predefined_tags()
 
     # Ensure generated directories exist
-    os.makedirs(os.path.join(settings.GENERATED_DIR, "images"), exist_ok=True)
-    os.makedirs(os.path.join(settings.GENERATED_DIR, "videos"), exist_ok=True)
+    settings.IMAGES_DIR.mkdir(parents=True, exist_ok=True)
+    settings.VIDEOS_DIR.mkdir(parents=True, exist_ok=True)
+
+    # Probe FFmpeg once instead of on every video request
+    app.state.ffmpeg_available = await asyncio.to_thread(is_ffmpeg_available)
+    app.state.video_encoder = (
+        await asyncio.to_thread(detect_video_encoder)
+        if app.state.ffmpeg_available
+        else DEFAULT_ENCODER
+    )
+
+    # Worker processes for CPU-bound rendering, so PIL work doesn't hold the GIL
+    # against request handling. Workers are spawned lazily on first use.
+    app.state.image_pool = ProcessPoolExecutor(
+        max_workers=os.cpu_count(),
+        mp_context=multiprocessing.get_context("spawn"),
+    )
 
     yield
 
+    app.state.image_pool.shutdown(cancel_futures=True)
+
 
-app = FastAPI(title="Relationship Solar System API", lifespan=lifespan)
+app = FastAPI(
+    title="Relationship Solar System API",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
+
+# Compress larger JSON payloads (people lists, snapshot state)
+app.add_middleware(GZipMiddleware, minimum_size=1024)
 
 app.add_middleware(
     CORSMiddleware,
@@ -51,4 +88,22 @@ app.include_router(ws_router.router)
 
 # Serve generated files (images, videos) as static files
 # Must come AFTER all include_router calls
-app.mount("/generated", StaticFiles(directory=settings.GENERATED_DIR), name="generated")
+app.mount(
+    "/generated", ImmutableStaticFiles(directory=settings.GENERATED_DIR), name="generated"
+)
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run(
+        "app.main:app",
+        host=settings.APP_HOST,
+        port=settings.APP_PORT,
+        loop="uvloop",
+        http="httptools",
+        # Negotiate permessage-deflate: the JSON event envelopes repeat the
+        # same keys and compress well
+        ws="websockets",
+        ws_per_message_deflate=True,
+    )
@@ -1,6 +1,17 @@
 import uuid
 
-from sqlalchemy import Column, DateTime, Float, ForeignKey, Integer, String, Text
+from sqlalchemy import (
+    Column,
+    Computed,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    text,
+)
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -10,6 +21,16 @@ from app.database import Base
 
 class Person(Base):
     __tablename__ = "people"
+    # Fetch the generated distance_from_center via RETURNING on INSERT/UPDATE
+    __mapper_args__ = {"eager_defaults": True}
+    __table_args__ = (
+        # Most queries filter a solar system's active (not soft-deleted) people
+        Index(
+            "ix_people_ss_active",
+            "solar_system_id",
+            postgresql_where=text("removed_at IS NULL"),
+        ),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     solar_system_id = Column(
@@ -24,8 +45,11 @@ class Person(Base):
     x_position = Column(Float, nullable=False, default=0.5)
     y_position = Column(Float, nullable=False, default=0.0)
 
-    # Server-computed: sqrt(x² + y²). Max theoretical value is ~1.414 (corner)
-    distance_from_center = Column(Float, nullable=False, default=0.5)
+    # Generated by Postgres: sqrt(x² + y²). Max theoretical value is ~1.414 (corner)
+    distance_from_center = Column(
+        Float,
+        Computed("sqrt(x_position * x_position + y_position * y_position)", persisted=True),
+    )
 
     tag_id = Column(
         UUID(as_uuid=True),
@@ -45,4 +69,4 @@ class Person(Base):
 
     # Relationships
     solar_system = relationship("SolarSystem", back_populates="people")
-    tag = relationship("Tag", back_populates="people")
+    tag = relationship("Tag", back_populates="people", lazy="joined")
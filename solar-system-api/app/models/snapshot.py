@@ -1,6 +1,6 @@
 import uuid
 
-from sqlalchemy import Column, DateTime, ForeignKey, String
+from sqlalchemy import Column, DateTime, ForeignKey, Index, String, desc, text
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -10,6 +10,17 @@ from app.database import Base
 
 class Snapshot(Base):
     __tablename__ = "snapshots"
+    __table_args__ = (
+        # Serves the newest-first snapshot history per solar system
+        Index("ix_snapshots_ss_created", "solar_system_id", desc("created_at")),
+        # Per-day activity counts for stats; the expression must match
+        # stats_service._SNAPSHOT_DAY for the planner to use it
+        Index(
+            "ix_snapshots_ss_day",
+            "solar_system_id",
+            text("(CAST(timezone('UTC', created_at) AS DATE))"),
+        ),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     solar_system_id = Column(
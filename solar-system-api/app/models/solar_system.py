@@ -26,8 +26,13 @@ class SolarSystem(Base):
 
     # Relationships
     user = relationship("User", back_populates="solar_system")
-    people = relationship("Person", back_populates="solar_system", lazy="selectin")
-    tags = relationship("Tag", back_populates="solar_system", lazy="selectin")
+    # Collections are loaded explicitly at the call sites that iterate them
+    people = relationship("Person", back_populates="solar_system")
+    tags = relationship("Tag", back_populates="solar_system")
+    # Snapshots carry large JSONB payloads; always query them explicitly
     snapshots = relationship(
-        "Snapshot", back_populates="solar_system", order_by="Snapshot.created_at"
+        "Snapshot",
+        back_populates="solar_system",
+        order_by="Snapshot.created_at",
+        lazy="raise",
     )
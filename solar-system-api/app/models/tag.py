@@ -1,6 +1,6 @@
 import uuid
 
-from sqlalchemy import Boolean, Column, ForeignKey, String
+from sqlalchemy import Boolean, Column, ForeignKey, Index, String, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
@@ -9,6 +9,17 @@ from app.database import Base
 
 class Tag(Base):
     __tablename__ = "tags"
+    __table_args__ = (
+        # Predefined tags are fetched on every solar system load; keep that
+        # lookup to the handful of rows that match. Unique on name so the
+        # seeder can rely on ON CONFLICT DO NOTHING.
+        Index(
+            "ix_tags_predefined_name",
+            "name",
+            unique=True,
+            postgresql_where=text("is_predefined"),
+        ),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     solar_system_id = Column(
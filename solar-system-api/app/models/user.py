@@ -10,6 +10,8 @@ from app.database import Base
 
 class User(Base):
     __tablename__ = "users"
+    # Fetch server-generated created_at via RETURNING on INSERT
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(String(100), nullable=False)
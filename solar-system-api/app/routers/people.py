@@ -1,18 +1,18 @@
-import math
 from datetime import datetime, timezone
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import select
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql import func
 
 from app.database import get_db
 from app.models.person import Person
+from app.models.tag import Tag
 from app.schemas.person import BulkPositionUpdate, PersonCreate, PersonResponse, PersonUpdate
 from app.services.snapshot_service import capture_snapshot
 from app.services.solar_system_service import get_solar_system_by_user
-from app.services.ws_manager import ws_manager
+from app.services.ws_manager import pack_positions, ws_manager
 
 router = APIRouter(prefix="/api/solar-system/{user_id}/people", tags=["people"])
 
@@ -21,13 +21,18 @@ router = APIRouter(prefix="/api/solar-system/{user_id}/people", tags=["people"])
 async def add_person(
     user_id: UUID,
     person_data: PersonCreate,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
 ):
     """Add a person to the solar system. Creates a snapshot."""
     ss = await get_solar_system_by_user(db, user_id)
 
-    # Compute distance from center
-    distance = math.sqrt(person_data.x_position**2 + person_data.y_position**2)
+    # Resolve the tag up front so the response doesn't need a post-flush refresh
+    tag = None
+    if person_data.tag_id is not None:
+        tag = await db.get(Tag, person_data.tag_id)
+        if not tag:
+            raise HTTPException(status_code=404, detail="Tag not found")
 
     # Create person
     person = Person(
@@ -35,8 +40,7 @@ async def add_person(
         name=person_data.name,
         x_position=person_data.x_position,
         y_position=person_data.y_position,
-        distance_from_center=distance,
-        tag_id=person_data.tag_id,
+        tag=tag,
         avatar_url=person_data.avatar_url,
         orbit_speed=person_data.orbit_speed,
         planet_size=person_data.planet_size,
@@ -45,22 +49,21 @@ async def add_person(
         relationship_score=person_data.relationship_score,
     )
     db.add(person)
-    await db.flush()
-    await db.refresh(person, attribute_names=["tag"])
-
-    # Determine tag name for summary
-    tag_name = person.tag.name if person.tag else "Untagged"
 
-    # Update solar system updated_at
+    # Update solar system updated_at in the same flush
     ss.updated_at = func.now()
     await db.flush()
 
+    # Determine tag name for summary
+    tag_name = tag.name if tag else "Untagged"
+
     # Create snapshot
     await capture_snapshot(
         db, ss.id, "person_added", f"Added {person.name} as {tag_name}"
     )
 
-    await ws_manager.broadcast_to_user(
+    background_tasks.add_task(
+        ws_manager.broadcast_to_user,
         user_id, "person_added", {"person_id": str(person.id), "name": person.name}
     )
 
@@ -71,6 +74,7 @@ async def add_person(
 async def bulk_update_positions(
     user_id: UUID,
     bulk_data: BulkPositionUpdate,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
 ):
     """
@@ -84,39 +88,44 @@ async def bulk_update_positions(
 
     person_ids = [item.person_id for item in bulk_data.updates]
 
-    # Fetch all people in one query
+    # Validate all exist and are active in this solar system
     result = await db.execute(
-        select(Person).where(
+        select(Person.id).where(
             Person.id.in_(person_ids),
             Person.solar_system_id == ss.id,
             Person.removed_at.is_(None),
         )
     )
-    people_map = {p.id: p for p in result.scalars().all()}
-
-    # Validate all exist
+    found_ids = set(result.scalars().all())
     for item in bulk_data.updates:
-        if item.person_id not in people_map:
+        if item.person_id not in found_ids:
             raise HTTPException(
                 status_code=404,
                 detail=f"Person {item.person_id} not found or not active",
             )
 
-    # Apply all updates
-    updated_people = []
-    for item in bulk_data.updates:
-        person = people_map[item.person_id]
-        person.x_position = item.x_position
-        person.y_position = item.y_position
-        person.distance_from_center = math.sqrt(
-            item.x_position**2 + item.y_position**2
-        )
-        updated_people.append(person)
-
-    await db.flush()
+    # Apply all updates as a single executemany UPDATE keyed on primary key
+    # (distance_from_center is recomputed by Postgres)
+    await db.execute(
+        update(Person),
+        [
+            {
+                "id": item.person_id,
+                "x_position": item.x_position,
+                "y_position": item.y_position,
+            }
+            for item in bulk_data.updates
+        ],
+    )
 
-    for person in updated_people:
-        await db.refresh(person, attribute_names=["tag"])
+    # Re-read the updated rows (with tags and new distances) for the response
+    result = await db.execute(
+        select(Person)
+        .where(Person.id.in_(person_ids))
+        .execution_options(populate_existing=True)
+    )
+    people_map = {p.id: p for p in result.scalars().all()}
+    updated_people = [people_map[pid] for pid in person_ids]
 
     ss.updated_at = func.now()
     await db.flush()
@@ -126,21 +135,13 @@ async def bulk_update_positions(
         db, ss.id, "bulk_update", f"Bulk updated {count} people's positions"
     )
 
-    await ws_manager.broadcast_to_user(
+    # Positions go out as packed binary records rather than a JSON list
+    background_tasks.add_task(
+        ws_manager.broadcast_binary_to_user,
         user_id,
         "bulk_update",
-        {
-            "updated_count": count,
-            "people": [
-                {
-                    "id": str(p.id),
-                    "x_position": p.x_position,
-                    "y_position": p.y_position,
-                    "distance_from_center": p.distance_from_center,
-                }
-                for p in updated_people
-            ],
-        },
+        {"updated_count": count},
+        pack_positions(updated_people),
     )
 
     return updated_people
@@ -151,6 +152,7 @@ async def update_person(
     user_id: UUID,
     person_id: UUID,
     update_data: PersonUpdate,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
 ):
     """Update a person's position, tag, or other fields. Creates a snapshot."""
@@ -178,13 +180,15 @@ async def update_person(
             person.x_position = update_data.x_position
         if update_data.y_position is not None:
             person.y_position = update_data.y_position
-        person.distance_from_center = math.sqrt(
-            person.x_position**2 + person.y_position**2
-        )
         position_changed = True
 
-    if update_data.tag_id is not None:
-        person.tag_id = update_data.tag_id
+    # person.tag was joined-loaded with the person, so only a real tag change
+    # needs to load the new Tag
+    if update_data.tag_id is not None and update_data.tag_id != person.tag_id:
+        tag = await db.get(Tag, update_data.tag_id)
+        if not tag:
+            raise HTTPException(status_code=404, detail="Tag not found")
+        person.tag = tag
         tag_changed = True
 
     # Apply new animation/visualization fields
@@ -199,10 +203,7 @@ async def update_person(
     if update_data.relationship_score is not None:
         person.relationship_score = update_data.relationship_score
 
-    await db.flush()
-    await db.refresh(person, attribute_names=["tag"])
-
-    # Update solar system updated_at
+    # Update solar system updated_at in the same flush
     ss.updated_at = func.now()
     await db.flush()
 
@@ -222,7 +223,8 @@ async def update_person(
     # Create snapshot
     await capture_snapshot(db, ss.id, change_type, change_summary)
 
-    await ws_manager.broadcast_to_user(
+    background_tasks.add_task(
+        ws_manager.broadcast_to_user,
         user_id, change_type, {"person_id": str(person.id), "name": person.name}
     )
 
@@ -233,6 +235,7 @@ async def update_person(
 async def remove_person(
     user_id: UUID,
     person_id: UUID,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
 ):
     """Soft-delete a person. Creates a snapshot."""
@@ -246,16 +249,16 @@ async def remove_person(
 
     person_name = person.name
     person.removed_at = datetime.now(timezone.utc)
-    await db.flush()
 
-    # Update solar system updated_at
+    # Update solar system updated_at in the same flush
     ss.updated_at = func.now()
     await db.flush()
 
     # Create snapshot
     await capture_snapshot(db, ss.id, "person_removed", f"Removed {person_name}")
 
-    await ws_manager.broadcast_to_user(
+    background_tasks.add_task(
+        ws_manager.broadcast_to_user,
         user_id, "person_removed", {"person_id": str(person_id), "name": person_name}
     )
 
@@ -1,7 +1,10 @@
+import base64
+from datetime import datetime
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import func, select
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import lambda_stmt, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
@@ -14,49 +17,80 @@ router = APIRouter(
 )
 
 
-@router.get("/", response_model=SnapshotPaginatedResponse)
+def _encode_cursor(created_at: datetime, snapshot_id: UUID) -> str:
+    raw = f"{created_at.isoformat()}|{snapshot_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        created_at, snapshot_id = raw.split("|")
+        return datetime.fromisoformat(created_at), UUID(snapshot_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from None
+
+
+@router.get(
+    "/",
+    response_model=SnapshotPaginatedResponse,
+    response_class=ORJSONResponse,
+)
 async def list_snapshots(
     user_id: UUID,
-    page: int = Query(default=1, ge=1),
+    cursor: str | None = Query(default=None),
     per_page: int = Query(default=20, ge=1, le=100),
     db: AsyncSession = Depends(get_db),
 ):
-    """List snapshots for a solar system (paginated, without full_state)."""
+    """
+    List snapshots for a solar system, newest first (without full_state).
+    Keyset-paginated: pass the returned next_cursor to fetch the next page.
+    """
     ss = await get_solar_system_by_user(db, user_id)
 
-    # Count total snapshots
-    count_result = await db.execute(
-        select(func.count()).select_from(Snapshot).where(
-            Snapshot.solar_system_id == ss.id
+    # Keyset pagination on (created_at, id) keeps every page an index range
+    # scan, however deep. One extra row tells us whether another page exists.
+    # Plain column rows skip the ORM identity map and full_state entirely;
+    # lambda_stmt caches the constructed statement and its compiled SQL.
+    ss_id = ss.id
+    limit = per_page + 1
+    stmt = lambda_stmt(
+        lambda: select(
+            Snapshot.id,
+            Snapshot.change_type,
+            Snapshot.change_summary,
+            Snapshot.created_at,
         )
+        .where(Snapshot.solar_system_id == ss_id)
+        .order_by(Snapshot.created_at.desc(), Snapshot.id.desc())
     )
-    total = count_result.scalar()
-
-    # Fetch page
-    offset = (page - 1) * per_page
-    result = await db.execute(
-        select(Snapshot)
-        .where(Snapshot.solar_system_id == ss.id)
-        .order_by(Snapshot.created_at.desc())
-        .offset(offset)
-        .limit(per_page)
-    )
-    snapshots = result.scalars().all()
+    if cursor is not None:
+        cursor_ts, cursor_id = _decode_cursor(cursor)
+        stmt += lambda s: s.where(
+            tuple_(Snapshot.created_at, Snapshot.id) < tuple_(cursor_ts, cursor_id)
+        )
+    stmt += lambda s: s.limit(limit)
+    rows = (await db.execute(stmt)).all()
 
-    return SnapshotPaginatedResponse(
-        snapshots=[
+    next_cursor = None
+    if len(rows) > per_page:
+        rows = rows[:per_page]
+        next_cursor = _encode_cursor(rows[-1].created_at, rows[-1].id)
+
+    # orjson serializes the UUIDs and datetimes natively; no Pydantic pass
+    return ORJSONResponse({
+        "snapshots": [
             {
-                "id": s.id,
-                "change_type": s.change_type,
-                "change_summary": s.change_summary,
-                "created_at": s.created_at,
+                "id": row.id,
+                "change_type": row.change_type,
+                "change_summary": row.change_summary,
+                "created_at": row.created_at,
             }
-            for s in snapshots
+            for row in rows
         ],
-        total=total,
-        page=page,
-        per_page=per_page,
-    )
+        "next_cursor": next_cursor,
+        "per_page": per_page,
+    })
 
 
 @router.get("/{snapshot_id}", response_model=SnapshotDetail)
@@ -1,19 +1,23 @@
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.sql import func
 
 from app.database import get_db
 from app.schemas.solar_system import SolarSystemResponse, SolarSystemStats, ThemeUpdate
 from app.services.solar_system_service import get_full_solar_system, get_solar_system_by_user
-from app.services.stats_service import compute_stats
+from app.services.stats_service import get_cached_stats
 from app.services.ws_manager import ws_manager
 
 router = APIRouter(prefix="/api/solar-system", tags=["solar-system"])
 
 
-@router.get("/{user_id}", response_model=SolarSystemResponse)
+@router.get(
+    "/{user_id}",
+    response_model=SolarSystemResponse,
+    response_class=ORJSONResponse,
+)
 async def get_solar_system(user_id: UUID, db: AsyncSession = Depends(get_db)):
     """
     Get the full solar system state for a user.
@@ -22,13 +26,18 @@ async def get_solar_system(user_id: UUID, db: AsyncSession = Depends(get_db)):
     result = await get_full_solar_system(db, user_id)
     if not result:
         raise HTTPException(status_code=404, detail="Solar system not found")
-    return result
+    # Validate once and hand orjson plain JSON types, skipping FastAPI's
+    # second response_model validation pass on this large nested payload
+    return ORJSONResponse(
+        SolarSystemResponse.model_validate(result).model_dump(mode="json")
+    )
 
 
 @router.patch("/{user_id}/theme")
 async def update_theme(
     user_id: UUID,
     theme_data: ThemeUpdate,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
 ):
     """
@@ -36,11 +45,11 @@ async def update_theme(
     The backend stores this as-is; the frontend controls the schema.
     """
     ss = await get_solar_system_by_user(db, user_id)
-    ss.theme = theme_data.theme
-    ss.updated_at = func.now()
+    ss.theme = theme_data.theme  # updated_at is bumped by the column's onupdate
     await db.flush()
 
-    await ws_manager.broadcast_to_user(
+    background_tasks.add_task(
+        ws_manager.broadcast_to_user,
         user_id, "theme_updated", {"theme": theme_data.theme}
     )
 
@@ -51,5 +60,5 @@ async def update_theme(
 async def get_stats(user_id: UUID, db: AsyncSession = Depends(get_db)):
     """Get computed analytics for the solar system."""
     ss = await get_solar_system_by_user(db, user_id)
-    stats = await compute_stats(db, ss.id)
+    stats = await get_cached_stats(db, ss.id, ss.updated_at)
     return stats
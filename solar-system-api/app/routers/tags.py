@@ -1,14 +1,16 @@
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import select, update
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import delete, func, insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
-from app.models.person import Person
+from app.models.solar_system import SolarSystem
 from app.models.tag import Tag
 from app.schemas.tag import TagCreate, TagResponse, TagUpdate
 from app.services.solar_system_service import get_solar_system_by_user
+from app.services.tag_service import get_cached_predefined_tags
 
 router = APIRouter(tags=["tags"])
 
@@ -16,10 +18,7 @@ router = APIRouter(tags=["tags"])
 @router.get("/api/tags/predefined", response_model=list[TagResponse])
 async def get_predefined_tags(db: AsyncSession = Depends(get_db)):
     """Get all predefined (global) tags."""
-    result = await db.execute(
-        select(Tag).where(Tag.is_predefined == True)  # noqa: E712
-    )
-    return result.scalars().all()
+    return ORJSONResponse(await get_cached_predefined_tags(db))
 
 
 @router.post(
@@ -35,17 +34,52 @@ async def create_custom_tag(
     """Create a custom tag for a user's solar system."""
     ss = await get_solar_system_by_user(db, user_id)
 
-    tag = Tag(
-        solar_system_id=ss.id,
-        name=tag_data.name,
-        color=tag_data.color,
-        icon=tag_data.icon,
-        is_predefined=False,
+    # RETURNING hands back the full row, so no refresh SELECT is needed
+    result = await db.execute(
+        insert(Tag)
+        .values(
+            solar_system_id=ss.id,
+            name=tag_data.name,
+            color=tag_data.color,
+            icon=tag_data.icon,
+            is_predefined=False,
+        )
+        .returning(Tag)
     )
-    db.add(tag)
-    await db.flush()
-    await db.refresh(tag)
-    return tag
+    return result.scalar_one()
+
+
+def _user_solar_system_id(user_id: UUID):
+    """Scalar subquery for the user's solar system id, to scope tag writes."""
+    return (
+        select(SolarSystem.id)
+        .where(SolarSystem.user_id == user_id)
+        .scalar_subquery()
+    )
+
+
+async def _touch_solar_system(db: AsyncSession, solar_system_id: UUID) -> None:
+    """Bump updated_at so cached stats (tag distribution) are recomputed."""
+    await db.execute(
+        update(SolarSystem)
+        .where(SolarSystem.id == solar_system_id)
+        .values(updated_at=func.now())
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def _raise_tag_not_writable(
+    db: AsyncSession, user_id: UUID, tag_id: UUID, action: str
+) -> None:
+    """Failure path of a scoped tag write: pick the right 404/403."""
+    await get_solar_system_by_user(db, user_id)  # 404 if the user has no system
+    is_predefined = await db.scalar(
+        select(Tag.is_predefined).where(Tag.id == tag_id)
+    )
+    if is_predefined:
+        raise HTTPException(status_code=403, detail=f"Cannot {action} predefined tags")
+    # Missing, or a custom tag belonging to another user's solar system
+    raise HTTPException(status_code=404, detail="Tag not found")
 
 
 @router.patch(
@@ -59,23 +93,31 @@ async def update_tag(
     db: AsyncSession = Depends(get_db),
 ):
     """Update a custom tag. Returns 403 for predefined tags."""
-    await get_solar_system_by_user(db, user_id)  # Verify user exists
-
-    tag = await db.get(Tag, tag_id)
-    if not tag:
-        raise HTTPException(status_code=404, detail="Tag not found")
-    if tag.is_predefined:
-        raise HTTPException(status_code=403, detail="Cannot modify predefined tags")
-
-    if tag_data.name is not None:
-        tag.name = tag_data.name
-    if tag_data.color is not None:
-        tag.color = tag_data.color
-    if tag_data.icon is not None:
-        tag.icon = tag_data.icon
-
-    await db.flush()
-    await db.refresh(tag)
+    # Scoped to the user's solar system in the same statement, so no
+    # separate existence check is needed on the success path
+    scope = (
+        Tag.id == tag_id,
+        Tag.solar_system_id == _user_solar_system_id(user_id),
+        Tag.is_predefined == False,  # noqa: E712
+    )
+    values = tag_data.model_dump(exclude_none=True)
+    if values:
+        stmt = (
+            update(Tag)
+            .where(*scope)
+            .values(**values)
+            .returning(Tag)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+    else:
+        # Nothing to change: behave like a GET on the custom tag
+        stmt = select(Tag).where(*scope)
+    tag = (await db.execute(stmt)).scalar_one_or_none()
+
+    if tag is None:
+        await _raise_tag_not_writable(db, user_id, tag_id, "modify")
+    if values:
+        await _touch_solar_system(db, tag.solar_system_id)
     return tag
 
 
@@ -86,19 +128,22 @@ async def delete_tag(
     db: AsyncSession = Depends(get_db),
 ):
     """Delete a custom tag. Returns 403 for predefined tags. Unlinks people using this tag."""
-    await get_solar_system_by_user(db, user_id)  # Verify user exists
-
-    tag = await db.get(Tag, tag_id)
-    if not tag:
-        raise HTTPException(status_code=404, detail="Tag not found")
-    if tag.is_predefined:
-        raise HTTPException(status_code=403, detail="Cannot delete predefined tags")
-
-    # Unlink all people using this tag
-    await db.execute(
-        update(Person).where(Person.tag_id == tag_id).values(tag_id=None)
+    # Scoped to the user's solar system, so nothing is written unless the tag
+    # is theirs. people.tag_id is ON DELETE SET NULL, so Postgres unlinks the
+    # deleted tag's people (and only those) as part of this statement.
+    result = await db.execute(
+        delete(Tag)
+        .where(
+            Tag.id == tag_id,
+            Tag.solar_system_id == _user_solar_system_id(user_id),
+            Tag.is_predefined == False,  # noqa: E712
+        )
+        .returning(Tag.solar_system_id)
+        .execution_options(synchronize_session=False)
     )
+    solar_system_id = result.scalar_one_or_none()
+    if solar_system_id is None:
+        await _raise_tag_not_writable(db, user_id, tag_id, "delete")
+    await _touch_solar_system(db, solar_system_id)
 
-    await db.delete(tag)
-    await db.flush()
     return {"message": "Tag deleted"}
@@ -1,15 +1,14 @@
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import select
+from sqlalchemy import lambda_stmt, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
 from app.database import get_db
 from app.models.solar_system import SolarSystem
 from app.models.user import User
 from app.schemas.user import UserCreate, UserResponse
-from app.services.snapshot_service import capture_snapshot
+from app.services.snapshot_service import build_state_dict, capture_snapshot
 
 router = APIRouter(prefix="/api/users", tags=["users"])
 
@@ -17,28 +16,25 @@ router = APIRouter(prefix="/api/users", tags=["users"])
 @router.post("/", response_model=UserResponse, status_code=201)
 async def create_user(user_data: UserCreate, db: AsyncSession = Depends(get_db)):
     """Create a user. Auto-creates their SolarSystem and initial snapshot."""
-    # 1. Create user
+    # 1. Create user and auto-create their solar system. Both ids are
+    # client-side uuid4 defaults and created_at comes back via RETURNING,
+    # so a single flush covers both INSERTs without any refresh.
     user = User(
         name=user_data.name,
         email=user_data.email,
         avatar_url=user_data.avatar_url,
     )
-    db.add(user)
+    solar_system = SolarSystem(user=user)
+    db.add_all([user, solar_system])
     await db.flush()
-    await db.refresh(user)
 
-    # 2. Auto-create solar system
-    solar_system = SolarSystem(user_id=user.id)
-    db.add(solar_system)
-    await db.flush()
-    await db.refresh(solar_system)
-
-    # 3. Create initial snapshot
+    # 2. Create initial snapshot (a new system has no people, so no need to re-fetch)
     await capture_snapshot(
         db,
         solar_system.id,
         "system_created",
         f"Solar system created for {user.name}",
+        state=build_state_dict(user, []),
     )
 
     return UserResponse(
@@ -55,19 +51,22 @@ async def create_user(user_data: UserCreate, db: AsyncSession = Depends(get_db))
 async def get_user(user_id: UUID, db: AsyncSession = Depends(get_db)):
     """Get a user by ID."""
     result = await db.execute(
-        select(User)
-        .options(selectinload(User.solar_system))
-        .where(User.id == user_id)
+        lambda_stmt(
+            lambda: select(User, SolarSystem.id.label("ss_id"))
+            .outerjoin(SolarSystem, SolarSystem.user_id == User.id)
+            .where(User.id == user_id)
+        )
     )
-    user = result.scalar_one_or_none()
-    if not user:
+    row = result.first()
+    if not row:
         raise HTTPException(status_code=404, detail="User not found")
+    user = row.User
 
     return UserResponse(
         id=user.id,
         name=user.name,
         email=user.email,
         avatar_url=user.avatar_url,
-        solar_system_id=user.solar_system.id if user.solar_system else None,
+        solar_system_id=row.ss_id,
         created_at=user.created_at,
     )
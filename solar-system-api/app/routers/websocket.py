@@ -17,8 +17,15 @@ async def solar_system_ws(user_id: UUID, websocket: WebSocket):
     - bulk_update, theme_updated
 
     Event format: {"event_type": "...", "data": {...}, "timestamp": "..."}
+    Events raised within a few milliseconds of each other arrive together as
+    {"batch": [event, ...]}, in the order they occurred.
+
+    bulk_update is a binary frame: 4-byte little-endian header length, JSON
+    header ({"event_type", "timestamp", "updated_count"}), then 28-byte records
+    of person UUID + x, y, distance_from_center as little-endian float32.
     """
-    await ws_manager.connect(user_id, websocket)
+    if not await ws_manager.connect(user_id, websocket):
+        return
     try:
         while True:
             await websocket.receive_text()
@@ -2,7 +2,7 @@ from app.schemas.user import UserCreate, UserResponse
 from app.schemas.solar_system import SolarSystemResponse, SolarSystemUserInfo, SolarSystemStats, ThemeUpdate
 from app.schemas.person import PersonCreate, PersonUpdate, PersonResponse, BulkPositionItem, BulkPositionUpdate
 from app.schemas.tag import TagCreate, TagUpdate, TagResponse, TagInPerson
-from app.schemas.snapshot import SnapshotListItem, SnapshotDetail, SnapshotPaginatedResponse
+from app.schemas.snapshot import SnapshotListItem, SnapshotDetail, SnapshotPaginatedResponse, SnapshotPerson
 from app.schemas.generation import ImageGenerationResponse, VideoGenerationRequest, VideoGenerationResponse
 
 __all__ = [
@@ -10,6 +10,6 @@ __all__ = [
     "SolarSystemResponse", "SolarSystemUserInfo", "SolarSystemStats", "ThemeUpdate",
     "PersonCreate", "PersonUpdate", "PersonResponse", "BulkPositionItem", "BulkPositionUpdate",
     "TagCreate", "TagUpdate", "TagResponse", "TagInPerson",
-    "SnapshotListItem", "SnapshotDetail", "SnapshotPaginatedResponse",
+    "SnapshotListItem", "SnapshotDetail", "SnapshotPaginatedResponse", "SnapshotPerson",
     "ImageGenerationResponse", "VideoGenerationRequest", "VideoGenerationResponse",
 ]
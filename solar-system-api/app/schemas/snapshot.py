@@ -4,6 +4,8 @@ from typing import Any
 
 from pydantic import BaseModel, ConfigDict
 
+from app.schemas.tag import TagInPerson
+
 
 class SnapshotListItem(BaseModel):
     id: uuid.UUID
@@ -27,6 +29,24 @@ class SnapshotDetail(BaseModel):
 
 class SnapshotPaginatedResponse(BaseModel):
     snapshots: list[SnapshotListItem]
-    total: int
-    page: int
+    next_cursor: str | None = None
     per_page: int
+
+
+class SnapshotPerson(BaseModel):
+    """A person entry inside a snapshot's full_state."""
+    id: uuid.UUID
+    name: str
+    x_position: float
+    y_position: float
+    distance_from_center: float
+    tag: TagInPerson | None = None
+    avatar_url: str | None = None
+    is_active: bool = True
+    orbit_speed: float
+    planet_size: float
+    custom_color: str | None = None
+    notes: str | None = None
+    relationship_score: int | None = None
+
+    model_config = ConfigDict(from_attributes=True)
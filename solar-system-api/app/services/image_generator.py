@@ -1,7 +1,7 @@
 """
 Strava-style image generator for the Relationship Solar System.
 
-Generates a 1080x1080 PNG with:
+Generates a 1080x1080 WebP with:
 - Deep space background with radial gradient
 - Star field (deterministic based on solar_system_id)
 - Orbital reference rings
@@ -12,12 +12,14 @@ Generates a 1080x1080 PNG with:
 - Title at top
 """
 
+import functools
+import hashlib
 import logging
 import math
-import random
 from datetime import datetime
 from pathlib import Path
 
+import numpy as np
 from PIL import Image, ImageDraw, ImageFilter, ImageFont
 
 logger = logging.getLogger(__name__)
@@ -49,7 +51,9 @@ def _load_font(name: str, size: int) -> ImageFont.FreeTypeFont | ImageFont.Image
     return font
 
 
+@functools.lru_cache(maxsize=1)
 def _get_fonts() -> dict[str, ImageFont.FreeTypeFont | ImageFont.ImageFont]:
+    """Font set shared by every render; built once per process."""
     return {
         "bold_20": _load_font("Inter-Bold.ttf", 20),
         "bold_18": _load_font("Inter-Bold.ttf", 18),
@@ -60,6 +64,10 @@ def _get_fonts() -> dict[str, ImageFont.FreeTypeFont | ImageFont.ImageFont]:
     }
 
 
+_GOLD = (255, 215, 0)  # #FFD700
+
+
+@functools.lru_cache(maxsize=64)
 def _hex_to_rgb(hex_color: str) -> tuple[int, int, int]:
     """Convert hex color string to RGB tuple."""
     hex_color = hex_color.lstrip("#")
@@ -70,48 +78,76 @@ def _hex_to_rgb(hex_color: str) -> tuple[int, int, int]:
     )
 
 
+@functools.lru_cache(maxsize=1)
+def _radial_gradient_layer() -> Image.Image:
+    """Build the gradient overlay once; it is the same for every image."""
+    center_color = (15, 27, 61)  # #0F1B3D
+    max_radius = 500
+
+    # Distance field from the center, quantized to 10px bands (center is
+    # brighter); alpha falls to zero at max_radius
+    yy, xx = np.ogrid[:HEIGHT, :WIDTH]
+    dist = np.sqrt((xx - CENTER[0]) ** 2 + (yy - CENTER[1]) ** 2)
+    band = np.maximum(np.ceil(dist / 10) * 10, 10)
+    alpha = np.clip(40 * (1.0 - band / max_radius), 0, None).astype(np.uint8)
+
+    layer = np.empty((HEIGHT, WIDTH, 4), dtype=np.uint8)
+    layer[..., :3] = center_color
+    layer[..., 3] = alpha
+    return Image.fromarray(layer, "RGBA")
+
+
 def _draw_radial_gradient(img: Image.Image) -> Image.Image:
     """Draw a subtle radial gradient from center (dark blue) to edges (deep space)."""
-    gradient_layer = Image.new("RGBA", (WIDTH, HEIGHT), (0, 0, 0, 0))
-    gradient_draw = ImageDraw.Draw(gradient_layer)
+    return Image.alpha_composite(img, _radial_gradient_layer())
 
-    center_color = (15, 27, 61)  # #0F1B3D
-    max_radius = 500
 
-    for r in range(max_radius, 0, -10):
-        # Alpha decreases as radius increases (center is brighter)
-        alpha = int(40 * (1.0 - r / max_radius))
-        color = (*center_color, alpha)
-        bbox = (CENTER[0] - r, CENTER[1] - r, CENTER[0] + r, CENTER[1] + r)
-        gradient_draw.ellipse(bbox, fill=color)
+def _disc_offsets(r: int) -> tuple[np.ndarray, np.ndarray]:
+    """Pixel (dy, dx) offsets covering a filled disc of radius r."""
+    dy, dx = np.mgrid[-r:r + 1, -r:r + 1]
+    inside = dx * dx + dy * dy < r * r + r  # matches ImageDraw.ellipse
+    return dy[inside], dx[inside]
+
 
-    return Image.alpha_composite(img, gradient_layer)
+def _splat(
+    arr: np.ndarray, xs: np.ndarray, ys: np.ndarray, radii: np.ndarray, colors: np.ndarray
+) -> None:
+    """Write filled discs of the given radii/RGBA colors into arr (H, W, 4)."""
+    for r in np.unique(radii):
+        sel = radii == r
+        x, y, c = xs[sel], ys[sel], colors[sel]
+        for dy, dx in zip(*_disc_offsets(int(r))):
+            px, py = x + dx, y + dy
+            ok = (px >= 0) & (px < WIDTH) & (py >= 0) & (py < HEIGHT)
+            arr[py[ok], px[ok]] = c[ok]
 
 
-def _draw_stars(draw: ImageDraw.Draw, seed: str) -> None:
+def _draw_stars(img: Image.Image, seed: str) -> Image.Image:
     """Draw a deterministic star field."""
-    rng = random.Random(seed)
+    # Seed from a stable digest: hash(str) is salted per process, and the
+    # field must look the same from every worker
+    digest = hashlib.blake2b(str(seed).encode(), digest_size=8).digest()
+    rng = np.random.default_rng(int.from_bytes(digest, "big"))
+    arr = np.array(img)
 
     # 150 small stars (1-2px)
-    for _ in range(150):
-        x = rng.randint(0, WIDTH - 1)
-        y = rng.randint(0, HEIGHT - 1)
-        r = rng.choice([1, 1, 1, 2])
-        brightness = rng.randint(180, 255)
-        draw.ellipse(
-            [x - r, y - r, x + r, y + r],
-            fill=(brightness, brightness, brightness, 255),
-        )
+    xs = rng.integers(0, WIDTH, 150)
+    ys = rng.integers(0, HEIGHT, 150)
+    radii = rng.choice([1, 1, 1, 2], 150)
+    brightness = rng.integers(180, 256, 150, dtype=np.uint8)
+    colors = np.empty((150, 4), dtype=np.uint8)
+    colors[:, :3] = brightness[:, None]
+    colors[:, 3] = 255
+    _splat(arr, xs, ys, radii, colors)
 
     # 20 larger stars at 50% opacity for depth
-    for _ in range(20):
-        x = rng.randint(0, WIDTH - 1)
-        y = rng.randint(0, HEIGHT - 1)
-        r = rng.choice([2, 3])
-        draw.ellipse(
-            [x - r, y - r, x + r, y + r],
-            fill=(255, 255, 255, 128),
-        )
+    xs = rng.integers(0, WIDTH, 20)
+    ys = rng.integers(0, HEIGHT, 20)
+    radii = rng.choice([2, 3], 20)
+    colors = np.broadcast_to(np.array([255, 255, 255, 128], dtype=np.uint8), (20, 4))
+    _splat(arr, xs, ys, radii, colors)
+
+    return Image.fromarray(arr, "RGBA")
 
 
 def _draw_orbital_rings(draw: ImageDraw.Draw) -> None:
@@ -126,67 +162,120 @@ def _draw_orbital_rings(draw: ImageDraw.Draw) -> None:
         draw.ellipse(bbox, outline=(255, 255, 255, 18), width=1)
 
 
-def _draw_connections(draw: ImageDraw.Draw, people: list[dict]) -> None:
+def _project_people(people: list[dict]) -> dict[str, np.ndarray]:
+    """
+    Project people to pixel space once per render as parallel arrays.
+
+    Returns px/py (int pixel centers), rgb (N x 3 tag colors, white when
+    untagged) and alpha (per-person opacity multiplier) for the draw helpers.
+    """
+    n = len(people)
+    xs = np.fromiter((p["x_position"] for p in people), dtype=np.float64, count=n)
+    ys = np.fromiter((p["y_position"] for p in people), dtype=np.float64, count=n)
+    rgb = np.array(
+        [_hex_to_rgb(p["tag"]["color"]) if p.get("tag") else (255, 255, 255) for p in people],
+        dtype=np.uint8,
+    ).reshape(n, 3)
+    return {
+        # Truncate toward zero, like int()
+        "px": CENTER[0] + (xs * SCALE).astype(np.int64),
+        "py": CENTER[1] + (ys * SCALE).astype(np.int64),
+        "rgb": rgb,
+        "alpha": np.fromiter((p.get("alpha", 1.0) for p in people), dtype=np.float64, count=n),
+    }
+
+
+def _draw_connections(draw: ImageDraw.Draw, proj: dict[str, np.ndarray]) -> None:
     """Draw subtle connection lines from center to each person."""
-    for person in people:
-        px = CENTER[0] + int(person["x_position"] * SCALE)
-        py = CENTER[1] + int(person["y_position"] * SCALE)
+    for px, py, (r, g, b) in zip(
+        proj["px"].tolist(), proj["py"].tolist(), proj["rgb"].tolist()
+    ):
+        # ~15% opacity
+        draw.line([CENTER, (px, py)], fill=(r, g, b, 38), width=1)
+
+
+def _blur_drawn_region(
+    layer: Image.Image, radius: int
+) -> tuple[Image.Image, tuple[int, int]] | None:
+    """
+    Blur only a mostly transparent layer's drawn bounding box (plus the blur's
+    reach); everywhere else the blurred layer would be fully transparent.
+    Returns the blurred patch and where it goes, or None for an empty layer.
+    GaussianBlur is already Pillow's linear-time extended box blur.
+    """
+    bbox = layer.getbbox()
+    if bbox is None:
+        return None
+    pad = 3 * radius
+    box = (
+        max(bbox[0] - pad, 0),
+        max(bbox[1] - pad, 0),
+        min(bbox[2] + pad, WIDTH),
+        min(bbox[3] + pad, HEIGHT),
+    )
+    return layer.crop(box).filter(ImageFilter.GaussianBlur(radius=radius)), box[:2]
 
-        if person.get("tag"):
-            r, g, b = _hex_to_rgb(person["tag"]["color"])
-            line_color = (r, g, b, 38)  # ~15% opacity
-        else:
-            line_color = (255, 255, 255, 38)
 
-        draw.line([CENTER, (px, py)], fill=line_color, width=1)
+def _composite_blurred(img: Image.Image, layer: Image.Image, radius: int) -> Image.Image:
+    """Blur a mostly transparent layer and composite it onto img in place."""
+    blurred = _blur_drawn_region(layer, radius)
+    if blurred is not None:
+        patch, dest = blurred
+        img.alpha_composite(patch, dest=dest)
+    return img
 
 
-def _draw_people_glow(img: Image.Image, people: list[dict]) -> Image.Image:
+def _draw_people_glow(img: Image.Image, proj: dict[str, np.ndarray]) -> Image.Image:
     """Draw glow effects for all people on a single layer, then blur and composite."""
     glow_layer = Image.new("RGBA", (WIDTH, HEIGHT), (0, 0, 0, 0))
     glow_draw = ImageDraw.Draw(glow_layer)
 
-    for person in people:
-        px = CENTER[0] + int(person["x_position"] * SCALE)
-        py = CENTER[1] + int(person["y_position"] * SCALE)
+    # Concentric glow circles (radius, base alpha), alphas scaled per person
+    rings = [(26, 30), (24, 50), (22, 80)]
+    ring_alphas = [(base * proj["alpha"]).astype(np.int64).tolist() for _, base in rings]
 
-        alpha_mult = person.get("alpha", 1.0)
-        if person.get("tag"):
-            r, g, b = _hex_to_rgb(person["tag"]["color"])
-        else:
-            r, g, b = 255, 255, 255
-
-        # Draw concentric glow circles
-        for glow_r, base_alpha in [(26, 30), (24, 50), (22, 80)]:
-            alpha = int(base_alpha * alpha_mult)
+    for i, (px, py, (r, g, b)) in enumerate(
+        zip(proj["px"].tolist(), proj["py"].tolist(), proj["rgb"].tolist())
+    ):
+        for (glow_r, _), alphas in zip(rings, ring_alphas):
             glow_draw.ellipse(
                 [px - glow_r, py - glow_r, px + glow_r, py + glow_r],
-                fill=(r, g, b, alpha),
+                fill=(r, g, b, alphas[i]),
             )
 
-    # Blur the entire glow layer once
-    glow_layer = glow_layer.filter(ImageFilter.GaussianBlur(radius=4))
-    return Image.alpha_composite(img, glow_layer)
+    # Blur the whole glow layer once
+    return _composite_blurred(img, glow_layer, radius=4)
 
 
 def _draw_people_solid(
     draw: ImageDraw.Draw,
     people: list[dict],
+    proj: dict[str, np.ndarray],
     fonts: dict,
 ) -> None:
     """Draw solid planet circles and name labels for each person."""
-    for person in people:
-        px = CENTER[0] + int(person["x_position"] * SCALE)
-        py = CENTER[1] + int(person["y_position"] * SCALE)
-
-        alpha_mult = person.get("alpha", 1.0)
-        if person.get("tag"):
-            r, g, b = _hex_to_rgb(person["tag"]["color"])
-        else:
-            r, g, b = 255, 255, 255
-
-        planet_alpha = int(255 * alpha_mult)
-
+    font = fonts["regular_12"]
+    planet_alphas = (255 * proj["alpha"]).astype(np.int64).tolist()
+    name_alphas = (230 * proj["alpha"]).astype(np.int64).tolist()
+
+    # Centered label origins, measured by advance width (no bbox layout pass)
+    names = [person["name"] for person in people]
+    text_widths = np.fromiter(
+        (int(font.getlength(name)) for name in names), dtype=np.int64, count=len(names)
+    )
+    label_xs = (proj["px"] - text_widths // 2).tolist()
+    label_ys = (proj["py"] + 25).tolist()
+
+    for name, px, py, (r, g, b), planet_alpha, name_alpha, label_x, label_y in zip(
+        names,
+        proj["px"].tolist(),
+        proj["py"].tolist(),
+        proj["rgb"].tolist(),
+        planet_alphas,
+        name_alphas,
+        label_xs,
+        label_ys,
+    ):
         # Solid planet circle (20px radius)
         draw.ellipse(
             [px - 20, py - 20, px + 20, py + 20],
@@ -194,43 +283,45 @@ def _draw_people_solid(
         )
 
         # Name label below
-        name = person["name"]
-        text_bbox = draw.textbbox((0, 0), name, font=fonts["regular_12"])
-        text_width = text_bbox[2] - text_bbox[0]
-        name_alpha = int(230 * alpha_mult)
         draw.text(
-            (px - text_width // 2, py + 25),
+            (label_x, label_y),
             name,
             fill=(255, 255, 255, name_alpha),
-            font=fonts["regular_12"],
+            font=font,
         )
 
 
-def _draw_center_user(img: Image.Image, user: dict, fonts: dict) -> Image.Image:
-    """Draw the user at the center with a gold glow."""
-    # Glow layer for center
+@functools.lru_cache(maxsize=1)
+def _center_glow() -> tuple[Image.Image, tuple[int, int]]:
+    """
+    Blurred gold bloom behind the user. It never moves or changes, so it is
+    drawn and blurred once instead of allocating a full-frame layer per render.
+    """
     glow_layer = Image.new("RGBA", (WIDTH, HEIGHT), (0, 0, 0, 0))
     glow_draw = ImageDraw.Draw(glow_layer)
 
-    gold = (255, 215, 0)  # #FFD700
-
     # Bloom glow at radii 52, 48, 44
     for glow_r, alpha in [(52, 15), (48, 25), (44, 40)]:
         glow_draw.ellipse(
             [CENTER[0] - glow_r, CENTER[1] - glow_r,
              CENTER[0] + glow_r, CENTER[1] + glow_r],
-            fill=(*gold, alpha),
+            fill=(*_GOLD, alpha),
         )
 
-    glow_layer = glow_layer.filter(ImageFilter.GaussianBlur(radius=6))
-    img = Image.alpha_composite(img, glow_layer)
+    return _blur_drawn_region(glow_layer, radius=6)
+
+
+def _draw_center_user(img: Image.Image, user: dict, fonts: dict) -> Image.Image:
+    """Draw the user at the center with a gold glow."""
+    patch, dest = _center_glow()
+    img.alpha_composite(patch, dest=dest)
 
     draw = ImageDraw.Draw(img)
 
     # Solid gold circle (40px radius)
     draw.ellipse(
         [CENTER[0] - 40, CENTER[1] - 40, CENTER[0] + 40, CENTER[1] + 40],
-        fill=(*gold, 255),
+        fill=(*_GOLD, 255),
     )
 
     # "YOU" label above
@@ -316,6 +407,38 @@ def _draw_title(draw: ImageDraw.Draw, fonts: dict) -> None:
     draw.line([(510, 55), (570, 55)], fill=(255, 255, 255, 51), width=1)
 
 
+@functools.lru_cache(maxsize=32)
+def _render_background(seed: str) -> Image.Image:
+    """
+    Render the static layers (gradient, stars, rings, title) for a seed.
+
+    These never change between renders for the same user, so the result is
+    cached and every image or video frame starts from a copy of it.
+    """
+    img = Image.new("RGBA", (WIDTH, HEIGHT), (10, 10, 26, 255))
+    img = _draw_radial_gradient(img)
+    img = _draw_stars(img, seed)
+
+    draw = ImageDraw.Draw(img)
+    _draw_orbital_rings(draw)
+    _draw_title(draw, _get_fonts())
+    return img
+
+
+def _new_canvas(seed: str) -> Image.Image:
+    """Return a fresh, mutable copy of the cached background for a seed."""
+    return _render_background(seed).copy()
+
+
+def _flatten(img: Image.Image) -> Image.Image:
+    """Composite the RGBA canvas onto the solid background color as RGB."""
+    final = Image.new("RGB", (WIDTH, HEIGHT), (10, 10, 26))
+    # An RGBA image passed as the mask supplies its own alpha band, without
+    # the extra per-band images split() allocates
+    final.paste(img, mask=img)
+    return final
+
+
 def generate_solar_system_image(state: dict, output_path: str) -> str:
     """
     Generate a 1080x1080 Strava-style image from solar system state.
@@ -323,39 +446,31 @@ def generate_solar_system_image(state: dict, output_path: str) -> str:
 
     Args:
         state: The solar system state dict (same format as snapshot full_state)
-        output_path: Where to save the PNG
+        output_path: Where to save the WebP
 
     Returns:
         The output_path
     """
     fonts = _get_fonts()
 
-    # 1. Create base image
-    img = Image.new("RGBA", (WIDTH, HEIGHT), (10, 10, 26, 255))
-
-    # 2. Radial gradient background
-    img = _draw_radial_gradient(img)
-
-    draw = ImageDraw.Draw(img)
-
-    # 3. Star field (deterministic seed)
+    # 1-4. Cached static background: gradient, star field (deterministic
+    # seed), orbital reference rings and title
     seed = state.get("user", {}).get("id", "default")
-    _draw_stars(draw, seed)
-
-    # 4. Orbital reference rings
-    _draw_orbital_rings(draw)
+    img = _new_canvas(seed)
+    draw = ImageDraw.Draw(img)
 
     people = state.get("people", [])
+    proj = _project_people(people)
 
     # 5. Connection lines
-    _draw_connections(draw, people)
+    _draw_connections(draw, proj)
 
     # 6. People glow effects (batched)
-    img = _draw_people_glow(img, people)
+    img = _draw_people_glow(img, proj)
 
     # 7. People solid circles + labels
     draw = ImageDraw.Draw(img)
-    _draw_people_solid(draw, people, fonts)
+    _draw_people_solid(draw, people, proj, fonts)
 
     # 8. Center user with glow
     img = _draw_center_user(img, state.get("user", {}), fonts)
@@ -363,13 +478,9 @@ def generate_solar_system_image(state: dict, output_path: str) -> str:
     # 9. Stats bar
     img = _draw_stats_bar(img, state, fonts)
 
-    # 10. Title
-    draw = ImageDraw.Draw(img)
-    _draw_title(draw, fonts)
-
-    # Convert to RGB and save
-    final = Image.new("RGB", (WIDTH, HEIGHT), (10, 10, 26))
-    final.paste(img, mask=img.split()[3])
-    final.save(output_path, "PNG", quality=95)
+    # Convert to RGB and save. Lossy WebP is ~3x smaller than PNG for the
+    # gradients and blurs here; method 2 encodes about as fast as PNG at zlib
+    # level 1 (method 4 is ~3x slower for a few percent smaller files)
+    _flatten(img).save(output_path, "WEBP", quality=90, method=2)
 
     return output_path
@@ -1,6 +1,8 @@
+from collections import Counter
 from datetime import datetime, timezone
 from uuid import UUID
 
+from pydantic import TypeAdapter
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
@@ -8,6 +10,35 @@ from sqlalchemy.orm import selectinload
 from app.models.person import Person
 from app.models.snapshot import Snapshot
 from app.models.solar_system import SolarSystem
+from app.models.user import User
+from app.schemas.snapshot import SnapshotPerson
+
+_people_adapter = TypeAdapter(list[SnapshotPerson])
+
+
+def build_state_dict(user: User, people: list[Person]) -> dict:
+    """
+    Build the full_state dict for a user and their active people.
+    Used both for snapshots and for image generation.
+    """
+    people_list = _people_adapter.dump_python(
+        _people_adapter.validate_python(people, from_attributes=True), mode="json"
+    )
+
+    # Build tags_summary count
+    tags_summary = dict(Counter(p.tag.name if p.tag else "Untagged" for p in people))
+
+    return {
+        "user": {
+            "id": str(user.id),
+            "name": user.name,
+            "avatar_url": user.avatar_url,
+        },
+        "people": people_list,
+        "tags_summary": tags_summary,
+        "total_active_people": len(people_list),
+        "snapshot_timestamp": datetime.now(timezone.utc).isoformat(),
+    }
 
 
 async def capture_snapshot(
@@ -15,73 +46,36 @@ async def capture_snapshot(
     solar_system_id: UUID,
     change_type: str,
     change_summary: str,
+    state: dict | None = None,
 ) -> Snapshot:
     """
     Captures the FULL current state of the solar system and saves it as a snapshot.
     Called after every mutation (add/move/remove person, etc.)
 
     Must be called AFTER the mutation has been flushed but BEFORE commit.
+    Pass `state` (from build_state_dict) when the caller already has it, to
+    skip re-fetching the solar system.
     """
-    # Fetch solar system with user and all people (with their tags)
-    result = await db.execute(
-        select(SolarSystem)
-        .options(
-            selectinload(SolarSystem.user),
-            selectinload(SolarSystem.people).selectinload(Person.tag),
+    if state is None:
+        # Fetch solar system with user and all people (with their tags)
+        result = await db.execute(
+            select(SolarSystem)
+            .options(
+                selectinload(SolarSystem.user),
+                selectinload(SolarSystem.people).joinedload(Person.tag),
+            )
+            .where(SolarSystem.id == solar_system_id)
         )
-        .where(SolarSystem.id == solar_system_id)
-    )
-    ss = result.scalar_one()
-
-    # Filter to active people only (removed_at IS NULL)
-    active_people = [p for p in ss.people if p.removed_at is None]
-
-    # Build tags_summary count
-    tags_summary: dict[str, int] = {}
-    for person in active_people:
-        tag_name = person.tag.name if person.tag else "Untagged"
-        tags_summary[tag_name] = tags_summary.get(tag_name, 0) + 1
+        ss = result.scalar_one()
 
-    # Build full_state JSON
-    full_state = {
-        "user": {
-            "id": str(ss.user.id),
-            "name": ss.user.name,
-            "avatar_url": ss.user.avatar_url,
-        },
-        "people": [
-            {
-                "id": str(p.id),
-                "name": p.name,
-                "x_position": p.x_position,
-                "y_position": p.y_position,
-                "distance_from_center": p.distance_from_center,
-                "tag": {
-                    "name": p.tag.name,
-                    "color": p.tag.color,
-                    "icon": p.tag.icon,
-                }
-                if p.tag
-                else None,
-                "avatar_url": p.avatar_url,
-                "is_active": True,
-                "orbit_speed": p.orbit_speed,
-                "planet_size": p.planet_size,
-                "custom_color": p.custom_color,
-                "notes": p.notes,
-                "relationship_score": p.relationship_score,
-            }
-            for p in active_people
-        ],
-        "tags_summary": tags_summary,
-        "total_active_people": len(active_people),
-        "snapshot_timestamp": datetime.now(timezone.utc).isoformat(),
-    }
+        # Filter to active people only (removed_at IS NULL)
+        active_people = [p for p in ss.people if p.removed_at is None]
+        state = build_state_dict(ss.user, active_people)
 
     # Create and save the snapshot
     snapshot = Snapshot(
         solar_system_id=solar_system_id,
-        full_state=full_state,
+        full_state=state,
         change_type=change_type,
         change_summary=change_summary,
     )
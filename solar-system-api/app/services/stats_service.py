@@ -1,7 +1,9 @@
+import time
 from datetime import datetime, timedelta, timezone
 from uuid import UUID
 
-from sqlalchemy import Date, cast, func, select
+import numpy as np
+from sqlalchemy import Date, cast, func, literal_column, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.person import Person
@@ -9,15 +11,52 @@ from app.models.snapshot import Snapshot
 from app.models.tag import Tag
 
 
+# solar_system_id -> (updated_at, expires_at, stats). Person and tag changes
+# bump solar_systems.updated_at, so a new updated_at invalidates the entry at
+# once; the TTL bounds staleness from changes that don't (day rollover).
+_STATS_CACHE: dict[UUID, tuple[datetime | None, float, dict]] = {}
+_STATS_TTL_SECONDS = 30.0
+_STATS_CACHE_MAX = 1024
+
+# UTC calendar day of a snapshot. A plain ::date cast of a timestamptz depends
+# on the session TimeZone and can't be indexed; this form matches
+# ix_snapshots_ss_day (the literal keeps 'UTC' out of the bound params).
+_SNAPSHOT_DAY = cast(func.timezone(literal_column("'UTC'"), Snapshot.created_at), Date)
+
+
+async def get_cached_stats(
+    db: AsyncSession, solar_system_id: UUID, updated_at: datetime | None
+) -> dict:
+    """compute_stats() behind a short in-process cache keyed by (id, updated_at)."""
+    now = time.monotonic()
+    entry = _STATS_CACHE.get(solar_system_id)
+    if entry is not None and entry[0] == updated_at and entry[1] > now:
+        return entry[2]
+
+    stats = await compute_stats(db, solar_system_id)
+    if len(_STATS_CACHE) >= _STATS_CACHE_MAX:
+        for key in [k for k, v in _STATS_CACHE.items() if v[1] <= now]:
+            del _STATS_CACHE[key]
+        if len(_STATS_CACHE) >= _STATS_CACHE_MAX:
+            _STATS_CACHE.clear()
+    _STATS_CACHE[solar_system_id] = (updated_at, now + _STATS_TTL_SECONDS, stats)
+    return stats
+
+
 async def compute_stats(db: AsyncSession, solar_system_id: UUID) -> dict:
     """Compute analytics for a solar system."""
+    # Plain rows of just the columns used below; no ORM objects or tag join
     result = await db.execute(
-        select(Person).where(
+        select(
+            Person.name,
+            Person.distance_from_center,
+            Person.relationship_score,
+        ).where(
             Person.solar_system_id == solar_system_id,
             Person.removed_at.is_(None),
         )
     )
-    active_people = result.scalars().all()
+    active_people = result.all()
 
     total_people = len(active_people)
 
@@ -38,19 +77,22 @@ async def compute_stats(db: AsyncSession, solar_system_id: UUID) -> dict:
     closest = min(distances, key=lambda x: x[1])
     furthest = max(distances, key=lambda x: x[1])
 
-    # Tag distribution
-    tag_ids = {p.tag_id for p in active_people if p.tag_id is not None}
-    tag_name_map: dict = {}
-    if tag_ids:
-        tag_result = await db.execute(
-            select(Tag.id, Tag.name).where(Tag.id.in_(tag_ids))
+    # Tag distribution, aggregated by the database (NULL tag -> "Untagged")
+    tag_result = await db.execute(
+        select(Tag.name, func.count().label("count"))
+        .select_from(Person)
+        .outerjoin(Tag, Person.tag_id == Tag.id)
+        .where(
+            Person.solar_system_id == solar_system_id,
+            Person.removed_at.is_(None),
         )
-        tag_name_map = {row.id: row.name for row in tag_result}
-
+        .group_by(Tag.name)
+        .order_by(Tag.name)
+    )
     tag_distribution: dict[str, int] = {}
-    for p in active_people:
-        tag_name = tag_name_map.get(p.tag_id, "Untagged") if p.tag_id else "Untagged"
-        tag_distribution[tag_name] = tag_distribution.get(tag_name, 0) + 1
+    for row in tag_result:
+        name = row.name or "Untagged"
+        tag_distribution[name] = tag_distribution.get(name, 0) + row.count
 
     return {
         "total_people": total_people,
@@ -67,40 +109,44 @@ def _empty_score_distribution() -> dict[str, int]:
     return {"0-25": 0, "26-50": 0, "51-75": 0, "76-100": 0, "unscored": 0}
 
 
+# Right-open histogram edges for the 0-25 / 26-50 / 51-75 / 76-100 buckets
+_SCORE_BUCKET_EDGES = np.array([0, 26, 51, 76, 101])
+
+
 def _compute_score_distribution(people: list) -> dict[str, int]:
-    dist = _empty_score_distribution()
-    for p in people:
-        score = p.relationship_score
-        if score is None:
-            dist["unscored"] += 1
-        elif score <= 25:
-            dist["0-25"] += 1
-        elif score <= 50:
-            dist["26-50"] += 1
-        elif score <= 75:
-            dist["51-75"] += 1
-        else:
-            dist["76-100"] += 1
-    return dist
+    scores = np.fromiter(
+        (p.relationship_score for p in people if p.relationship_score is not None),
+        dtype=np.int16,
+    )
+    counts, _ = np.histogram(scores, bins=_SCORE_BUCKET_EDGES)
+    return {
+        "0-25": int(counts[0]),
+        "26-50": int(counts[1]),
+        "51-75": int(counts[2]),
+        "76-100": int(counts[3]),
+        "unscored": len(people) - scores.size,
+    }
 
 
 async def _get_timeline_activity(
     db: AsyncSession, solar_system_id: UUID
 ) -> list[dict]:
     """Get change counts per day for the last 30 days."""
-    cutoff = datetime.now(timezone.utc) - timedelta(days=30)
+    cutoff = (datetime.now(timezone.utc) - timedelta(days=30)).date()
 
+    # Filtering and grouping on the indexed day expression lets Postgres
+    # answer this from ix_snapshots_ss_day alone
     result = await db.execute(
         select(
-            cast(Snapshot.created_at, Date).label("date"),
+            _SNAPSHOT_DAY.label("date"),
             func.count().label("change_count"),
         )
         .where(
             Snapshot.solar_system_id == solar_system_id,
-            Snapshot.created_at >= cutoff,
+            _SNAPSHOT_DAY >= cutoff,
         )
-        .group_by(cast(Snapshot.created_at, Date))
-        .order_by(cast(Snapshot.created_at, Date))
+        .group_by(_SNAPSHOT_DAY)
+        .order_by(_SNAPSHOT_DAY)
     )
     rows = result.all()
 
@@ -0,0 +1,29 @@
+import asyncio
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.tag import Tag
+from app.schemas.tag import TagResponse
+
+
+# Predefined tags are seeded at startup and cannot be modified or deleted
+# through the API, so they are read once per process and served from memory.
+_PREDEFINED_CACHE: list[dict] | None = None
+_predefined_lock = asyncio.Lock()
+
+
+async def get_cached_predefined_tags(db: AsyncSession) -> list[dict]:
+    """Predefined tags as JSON-ready TagResponse dicts, cached per process."""
+    global _PREDEFINED_CACHE
+    if _PREDEFINED_CACHE is None:
+        async with _predefined_lock:
+            if _PREDEFINED_CACHE is None:
+                result = await db.execute(
+                    select(Tag).where(Tag.is_predefined == True)  # noqa: E712
+                )
+                _PREDEFINED_CACHE = [
+                    TagResponse.model_validate(tag).model_dump(mode="json")
+                    for tag in result.scalars().all()
+                ]
+    return _PREDEFINED_CACHE
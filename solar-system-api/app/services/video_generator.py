@@ -1,14 +1,16 @@
 """
 Timeline video generator for the Relationship Solar System.
 
-Renders individual frames using the same visual style as the image generator,
-then stitches them into an MP4 using FFmpeg.
+Renders individual frames using the same visual style as the image generator
+and streams them as raw RGB into FFmpeg, which encodes the MP4.
 """
 
 import asyncio
 import logging
 import os
-import tempfile
+import subprocess
+from collections import deque
+from concurrent.futures import Executor
 from uuid import UUID
 
 from PIL import Image, ImageDraw
@@ -22,17 +24,16 @@ from app.services.image_generator import (
     SCALE,
     WIDTH,
     _draw_connections,
-    _draw_orbital_rings,
-    _draw_radial_gradient,
-    _draw_stars,
-    _draw_title,
     _get_fonts,
+    _new_canvas,
+    _project_people,
     _draw_people_glow,
     _draw_people_solid,
     _draw_center_user,
     _draw_stats_bar,
+    _flatten,
 )
-from app.utils.interpolation import interpolate_snapshots
+from app.utils.interpolation import SnapshotPair
 
 logger = logging.getLogger(__name__)
 
@@ -41,6 +42,77 @@ DEFAULT_FPS = 30
 DEFAULT_HOLD_FRAMES = 60  # 2 seconds at 30fps
 DEFAULT_TRANSITION_FRAMES = 15  # 0.5 seconds
 
+# Frames per worker task. Rendered frames are held as raw RGB (~3.5 MB each)
+# until written to FFmpeg, so batches stay small and only a few are in flight.
+_BATCH_FRAMES = 4
+
+# H.264 encoders in order of preference, as (args before -i, args after -i).
+# Hardware encoders take the load off the CPU cores that render frames.
+_VAAPI_DEVICE = "/dev/dri/renderD128"
+_ENCODER_ARGS: dict[str, tuple[list[str], list[str]]] = {
+    "h264_nvenc": (
+        [],
+        ["-c:v", "h264_nvenc", "-preset", "p4", "-rc", "vbr", "-cq", "23",
+         "-pix_fmt", "yuv420p"],
+    ),
+    "h264_vaapi": (
+        ["-vaapi_device", _VAAPI_DEVICE],
+        ["-vf", "format=nv12,hwupload", "-c:v", "h264_vaapi", "-qp", "23"],
+    ),
+    "libx264": (
+        [],
+        ["-c:v", "libx264", "-pix_fmt", "yuv420p", "-preset", "fast", "-crf", "23"],
+    ),
+}
+DEFAULT_ENCODER = "libx264"
+
+# Snapshot full_state keys used when rendering frames
+_RENDER_STATE_KEYS = ("user", "people", "tags_summary", "total_active_people")
+
+
+def is_ffmpeg_available() -> bool:
+    """Check whether FFmpeg can be executed. Blocking — call once at startup."""
+    try:
+        subprocess.run(
+            ["ffmpeg", "-version"], check=True, capture_output=True, timeout=10
+        )
+    except (FileNotFoundError, subprocess.SubprocessError):
+        return False
+    return True
+
+
+def detect_video_encoder() -> str:
+    """
+    Pick the fastest working H.264 encoder. Blocking — call once at startup.
+
+    An encoder being listed by ``ffmpeg -encoders`` doesn't mean the GPU or
+    driver is usable, so each candidate gets a one-frame test encode.
+    """
+    for encoder, (input_args, output_args) in _ENCODER_ARGS.items():
+        if encoder == DEFAULT_ENCODER:
+            break
+        if encoder == "h264_vaapi" and not os.path.exists(_VAAPI_DEVICE):
+            continue
+        try:
+            subprocess.run(
+                [
+                    "ffmpeg", "-hide_banner", "-loglevel", "error",
+                    *input_args,
+                    "-f", "lavfi", "-i", "color=black:s=256x256:d=0.1",
+                    "-frames:v", "1",
+                    *output_args,
+                    "-f", "null", "-",
+                ],
+                check=True,
+                capture_output=True,
+                timeout=10,
+            )
+        except (FileNotFoundError, subprocess.SubprocessError):
+            continue
+        logger.info(f"Using hardware video encoder {encoder}")
+        return encoder
+    return DEFAULT_ENCODER
+
 
 def _render_frame(
     state: dict,
@@ -58,32 +130,23 @@ def _render_frame(
     """
     fonts = _get_fonts()
 
-    # Base image
-    img = Image.new("RGBA", (WIDTH, HEIGHT), (10, 10, 26, 255))
-
-    # Background gradient
-    img = _draw_radial_gradient(img)
-
-    draw = ImageDraw.Draw(img)
-
-    # Star field
+    # Cached static background (gradient, stars, rings, title)
     seed = state.get("user", {}).get("id", "default")
-    _draw_stars(draw, seed)
-
-    # Orbital rings
-    _draw_orbital_rings(draw)
+    img = _new_canvas(seed)
+    draw = ImageDraw.Draw(img)
 
     people = state.get("people", [])
+    proj = _project_people(people)
 
     # Connection lines
-    _draw_connections(draw, people)
+    _draw_connections(draw, proj)
 
     # People glow (handles per-person alpha)
-    img = _draw_people_glow(img, people)
+    img = _draw_people_glow(img, proj)
 
     # People solid circles + labels (handles per-person alpha)
     draw = ImageDraw.Draw(img)
-    _draw_people_solid(draw, people, fonts)
+    _draw_people_solid(draw, people, proj, fonts)
 
     # Center user
     img = _draw_center_user(img, state.get("user", {}), fonts)
@@ -91,9 +154,7 @@ def _render_frame(
     # Stats bar
     img = _draw_stats_bar(img, state, fonts)
 
-    # Title
     draw = ImageDraw.Draw(img)
-    _draw_title(draw, fonts)
 
     # Change summary overlay (above stats bar)
     if change_summary:
@@ -112,9 +173,54 @@ def _render_frame(
     draw.rectangle([(0, HEIGHT - 4), (bar_width, HEIGHT)], fill=(255, 255, 255, 100))
 
     # Convert to RGB for video frames
-    final = Image.new("RGB", (WIDTH, HEIGHT), (10, 10, 26))
-    final.paste(img, mask=img.split()[3])
-    return final
+    return _flatten(img)
+
+
+def _render_frame_batch(
+    frames: list[tuple[int, dict, str | None]],
+    total_frames: int,
+) -> bytes:
+    """
+    Render a contiguous run of frames as concatenated rgb24 bytes. Runs in a
+    worker process, so it must stay a picklable module-level function.
+    """
+    return b"".join(
+        _render_frame(state, frame_index, total_frames, change_summary).tobytes()
+        for frame_index, state, change_summary in frames
+    )
+
+
+async def _stream_frames(
+    stdin: asyncio.StreamWriter,
+    frames: list[tuple[int, dict, str | None]],
+    total_frames: int,
+    executor: Executor | None,
+) -> None:
+    """
+    Render frames on the executor and write them to FFmpeg in order. Keeps a
+    bounded window of batches in flight so workers stay busy while memory
+    stays flat regardless of video length.
+    """
+    loop = asyncio.get_running_loop()
+    window = 2 * (os.cpu_count() or 1)
+    pending: deque[asyncio.Future[bytes]] = deque()
+    try:
+        for start in range(0, total_frames, _BATCH_FRAMES):
+            pending.append(loop.run_in_executor(
+                executor,
+                _render_frame_batch,
+                frames[start:start + _BATCH_FRAMES],
+                total_frames,
+            ))
+            if len(pending) >= window:
+                stdin.write(await pending.popleft())
+                await stdin.drain()
+        while pending:
+            stdin.write(await pending.popleft())
+            await stdin.drain()
+    finally:
+        for future in pending:
+            future.cancel()
 
 
 async def generate_video(
@@ -124,6 +230,8 @@ async def generate_video(
     fps: int = DEFAULT_FPS,
     hold_seconds: float = 2.0,
     transition_frames: int = DEFAULT_TRANSITION_FRAMES,
+    executor: Executor | None = None,
+    encoder: str = DEFAULT_ENCODER,
 ) -> str:
     """
     Generate a timeline video from all snapshots.
@@ -135,17 +243,27 @@ async def generate_video(
         fps: Frames per second
         hold_seconds: How long to hold each snapshot state
         transition_frames: Number of interpolation frames between snapshots
+        executor: Process pool to render frames on (defaults to the loop's
+            thread pool)
+        encoder: H.264 encoder from detect_video_encoder()
 
     Returns:
         The output_path
     """
-    # Fetch all snapshots ordered by creation time
+    # Fetch all snapshots ordered by creation time, projecting only the
+    # full_state keys the renderer reads
     result = await db.execute(
-        select(Snapshot)
+        select(
+            Snapshot.change_summary,
+            *(Snapshot.full_state[key].label(key) for key in _RENDER_STATE_KEYS),
+        )
         .where(Snapshot.solar_system_id == solar_system_id)
         .order_by(Snapshot.created_at.asc())
     )
-    snapshots = result.scalars().all()
+    snapshots = [
+        (row.change_summary, {key: row._mapping[key] for key in _RENDER_STATE_KEYS})
+        for row in result
+    ]
 
     if len(snapshots) < 2:
         raise ValueError("Need at least 2 snapshots to generate a video")
@@ -153,63 +271,65 @@ async def generate_video(
     hold_frames = int(hold_seconds * fps)
     total_frames = len(snapshots) * hold_frames + (len(snapshots) - 1) * transition_frames
 
-    def _render_all_frames(tmpdir: str) -> None:
-        """Render all frames to temporary directory. CPU-bound work."""
-        frame_index = 0
-
-        for i, snapshot in enumerate(snapshots):
-            state = snapshot.full_state
-
-            # Render hold frames (static display of this snapshot)
-            for _ in range(hold_frames):
-                frame = _render_frame(
-                    state, frame_index, total_frames, snapshot.change_summary
-                )
-                frame.save(os.path.join(tmpdir, f"frame_{frame_index:06d}.png"))
-                frame_index += 1
-
-            # Render transition frames to next snapshot (if not last)
-            if i < len(snapshots) - 1:
-                next_state = snapshots[i + 1].full_state
-                for t_step in range(transition_frames):
-                    t = t_step / transition_frames
-                    interpolated = interpolate_snapshots(state, next_state, t)
-                    frame = _render_frame(interpolated, frame_index, total_frames)
-                    frame.save(os.path.join(tmpdir, f"frame_{frame_index:06d}.png"))
-                    frame_index += 1
-
-        logger.info(f"Rendered {frame_index} frames to {tmpdir}")
-
-    with tempfile.TemporaryDirectory() as tmpdir:
-        # Render frames in thread pool (CPU-bound)
-        loop = asyncio.get_event_loop()
-        await loop.run_in_executor(None, _render_all_frames, tmpdir)
-
-        # Stitch with FFmpeg (async subprocess)
-        ffmpeg_cmd = [
-            "ffmpeg",
-            "-y",
-            "-framerate", str(fps),
-            "-i", os.path.join(tmpdir, "frame_%06d.png"),
-            "-c:v", "libx264",
-            "-pix_fmt", "yuv420p",
-            "-preset", "fast",
-            "-crf", "23",
-            output_path,
-        ]
-
-        process = await asyncio.create_subprocess_exec(
-            *ffmpeg_cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
-        stdout, stderr = await process.communicate()
-
-        if process.returncode != 0:
-            error_msg = stderr.decode() if stderr else "Unknown error"
-            logger.error(f"FFmpeg failed: {error_msg}")
-            raise RuntimeError(f"FFmpeg failed with exit code {process.returncode}")
-
-        logger.info(f"Video generated: {output_path}")
+    # Lay out every frame up front; interpolation is cheap next to rendering.
+    # Hold frames share one state object, which pickles once per batch.
+    frames: list[tuple[int, dict, str | None]] = []
+    for i, (change_summary, state) in enumerate(snapshots):
+        # Hold frames (static display of this snapshot)
+        for _ in range(hold_frames):
+            frames.append((len(frames), state, change_summary))
+
+        # Transition frames to next snapshot (if not last)
+        if i < len(snapshots) - 1:
+            next_state = snapshots[i + 1][1]
+            for interpolated in SnapshotPair(state, next_state).sequence(transition_frames):
+                frames.append((len(frames), interpolated, None))
+
+    input_args, output_args = _ENCODER_ARGS[encoder]
+    ffmpeg_cmd = [
+        "ffmpeg",
+        "-y",
+        "-loglevel", "error",
+        *input_args,
+        "-f", "rawvideo",
+        "-pix_fmt", "rgb24",
+        "-s", f"{WIDTH}x{HEIGHT}",
+        "-framerate", str(fps),
+        "-i", "-",
+        *output_args,
+        output_path,
+    ]
+
+    process = await asyncio.create_subprocess_exec(
+        *ffmpeg_cmd,
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    # Drain stderr alongside the writes so a chatty FFmpeg can't block on it
+    stderr_task = asyncio.create_task(process.stderr.read())
+
+    try:
+        await _stream_frames(process.stdin, frames, total_frames, executor)
+        process.stdin.close()
+        await process.stdin.wait_closed()
+    except (BrokenPipeError, ConnectionResetError):
+        # FFmpeg exited early; its exit code and stderr are reported below
+        pass
+    except BaseException:
+        process.kill()
+        await process.wait()
+        stderr_task.cancel()
+        raise
+
+    stderr = await stderr_task
+    await process.wait()
+
+    if process.returncode != 0:
+        error_msg = stderr.decode() if stderr else "Unknown error"
+        logger.error(f"FFmpeg failed: {error_msg}")
+        raise RuntimeError(f"FFmpeg failed with exit code {process.returncode}")
+
+    logger.info(f"Video generated: {output_path} ({total_frames} frames)")
 
     return output_path
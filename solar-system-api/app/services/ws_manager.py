@@ -1,51 +1,216 @@
-import json
+import asyncio
 from datetime import datetime, timezone
 from uuid import UUID
 
+import numpy as np
+import orjson
 from fastapi import WebSocket
 
+from app.config import settings
+
+# Record layout for binary position payloads: 16-byte person UUID, then
+# x, y and distance_from_center as little-endian float32 (28 bytes each)
+POSITION_DTYPE = np.dtype([("id", "V16"), ("x", "<f4"), ("y", "<f4"), ("distance", "<f4")])
+
+
+def pack_positions(people) -> bytes:
+    """
+    Pack people (anything with id, x_position, y_position and
+    distance_from_center) into contiguous POSITION_DTYPE records.
+    """
+    records = np.empty(len(people), dtype=POSITION_DTYPE)
+    records["id"] = np.frombuffer(b"".join(p.id.bytes for p in people), dtype="V16")
+    records["x"] = [p.x_position for p in people]
+    records["y"] = [p.y_position for p in people]
+    records["distance"] = [p.distance_from_center for p in people]
+    return records.tobytes()
+
+
+def _encode_events(events: list[dict]) -> str:
+    """
+    Encode queued JSON events as one text frame; a lone event keeps the plain
+    event format. orjson formats the datetimes natively (same ISO 8601 output
+    as isoformat()).
+    """
+    message = events[0] if len(events) == 1 else {"batch": events}
+    return orjson.dumps(message, default=str).decode()
+
 
 class ConnectionManager:
     """Manages WebSocket connections grouped by user_id."""
 
-    def __init__(self):
-        self._connections: dict[UUID, list[WebSocket]] = {}
+    def __init__(
+        self,
+        max_connections_per_user: int,
+        coalesce_window: float = 0.01,
+        max_batch: int = 32,
+        send_queue_size: int = 64,
+    ):
+        # Sets: WebSockets hash by identity, so disconnects are O(1)
+        self._connections: dict[UUID, set[WebSocket]] = {}
+        # Per-user pending events and the task that flushes them
+        self._queues: dict[UUID, asyncio.Queue[dict | bytes]] = {}
+        self._flushers: dict[UUID, asyncio.Task] = {}
+        # Per-socket bounded outbound frames and the task writing them
+        self._outboxes: dict[WebSocket, tuple[asyncio.Queue[str | bytes], asyncio.Task]] = {}
+        # Slow-consumer closes in flight (held so they aren't garbage collected)
+        self._closing: set[asyncio.Task] = set()
+        self.max_connections_per_user = max_connections_per_user
+        self.coalesce_window = coalesce_window
+        self.max_batch = max_batch
+        self.send_queue_size = send_queue_size
 
-    async def connect(self, user_id: UUID, websocket: WebSocket):
+    async def connect(self, user_id: UUID, websocket: WebSocket) -> bool:
+        """
+        Accept and register a connection. Returns False (after closing the
+        socket with 1013 "try again later") if the user is already at the cap.
+        """
         await websocket.accept()
-        if user_id not in self._connections:
-            self._connections[user_id] = []
-        self._connections[user_id].append(websocket)
+        if len(self._connections.get(user_id, ())) >= self.max_connections_per_user:
+            await websocket.close(code=1013)
+            return False
+        self._connections.setdefault(user_id, set()).add(websocket)
+        outbox: asyncio.Queue[str | bytes] = asyncio.Queue(maxsize=self.send_queue_size)
+        self._outboxes[websocket] = (
+            outbox,
+            asyncio.create_task(self._write_frames(user_id, websocket, outbox)),
+        )
+        if user_id not in self._flushers:
+            self._queues[user_id] = asyncio.Queue()
+            self._flushers[user_id] = asyncio.create_task(self._flush_events(user_id))
+        return True
 
     def disconnect(self, user_id: UUID, websocket: WebSocket):
-        if user_id in self._connections:
-            self._connections[user_id].remove(websocket)
-            if not self._connections[user_id]:
-                del self._connections[user_id]
+        # Tolerates sockets already removed: failed sends from a writer may
+        # race the endpoint's own disconnect
+        outbox = self._outboxes.pop(websocket, None)
+        if outbox is not None and outbox[1] is not asyncio.current_task():
+            outbox[1].cancel()
 
-    async def broadcast_to_user(self, user_id: UUID, event_type: str, data: dict):
-        """Send an event to all WebSocket connections for a given user."""
-        if user_id not in self._connections:
+        connections = self._connections.get(user_id)
+        if connections is None:
             return
+        connections.discard(websocket)
+        if not connections:
+            del self._connections[user_id]
+            del self._queues[user_id]
+            flusher = self._flushers.pop(user_id)
+            if flusher is not asyncio.current_task():
+                flusher.cancel()
 
-        message = json.dumps(
+    async def broadcast_to_user(self, user_id: UUID, event_type: str, data: dict):
+        """
+        Queue an event for all WebSocket connections of a given user.
+        Never raises for send failures, so it is safe to run as a background task.
+        """
+        queue = self._queues.get(user_id)
+        if queue is None:
+            return
+        queue.put_nowait(
             {
                 "event_type": event_type,
                 "data": data,
-                "timestamp": datetime.now(timezone.utc).isoformat(),
-            },
+                "timestamp": datetime.now(timezone.utc),
+            }
+        )
+
+    async def broadcast_binary_to_user(
+        self, user_id: UUID, event_type: str, header: dict, payload: bytes
+    ):
+        """
+        Queue a binary event for all WebSocket connections of a given user.
+
+        For bulky numeric payloads that would be several times larger as JSON.
+        The frame is a 4-byte little-endian header length, the JSON header
+        (event_type and timestamp merged into header) and the raw payload.
+        Binary frames keep their order relative to JSON events.
+        """
+        queue = self._queues.get(user_id)
+        if queue is None:
+            return
+        header_json = orjson.dumps(
+            {**header, "event_type": event_type, "timestamp": datetime.now(timezone.utc)},
             default=str,
         )
+        queue.put_nowait(len(header_json).to_bytes(4, "little") + header_json + payload)
+
+    async def _flush_events(self, user_id: UUID):
+        """
+        Send a user's queued events, coalescing bursts. After the first event
+        arrives, anything else queued within coalesce_window (up to max_batch)
+        goes out in the same frame.
+        """
+        queue = self._queues[user_id]
+        while True:
+            events = [await queue.get()]
+            await asyncio.sleep(self.coalesce_window)
+            while len(events) < self.max_batch and not queue.empty():
+                events.append(queue.get_nowait())
+
+            # Runs of JSON events share a text frame; binary frames go out
+            # as they are, in order
+            pending: list[dict] = []
+            for item in events:
+                if isinstance(item, bytes):
+                    if pending:
+                        self._enqueue_frame(user_id, _encode_events(pending))
+                        pending = []
+                    self._enqueue_frame(user_id, item)
+                else:
+                    pending.append(item)
+            if pending:
+                self._enqueue_frame(user_id, _encode_events(pending))
+
+            # Every socket overflowed and disconnect() retired this flusher
+            # (a reconnect will have started a fresh one)
+            if self._flushers.get(user_id) is not asyncio.current_task():
+                return
+
+    def _enqueue_frame(self, user_id: UUID, frame: str | bytes):
+        """
+        Hand one frame to every connection's writer. Never waits on a socket: a
+        client whose outbox is full has fallen too far behind, so it is closed
+        (1013 "try again later") and can reconnect and refetch state, rather
+        than buffering without bound or silently missing events.
+        """
+        # Snapshot: overflowing sockets are disconnected while we iterate
+        for ws in list(self._connections.get(user_id, ())):
+            try:
+                self._outboxes[ws][0].put_nowait(frame)
+            except asyncio.QueueFull:
+                self.disconnect(user_id, ws)
+                task = asyncio.create_task(self._close_quietly(ws))
+                self._closing.add(task)
+                task.add_done_callback(self._closing.discard)
 
-        stale = []
-        for ws in self._connections[user_id]:
+    async def _write_frames(
+        self, user_id: UUID, websocket: WebSocket, outbox: asyncio.Queue[str | bytes]
+    ):
+        """Send a socket's frames in order; drop the socket on the first failure."""
+        while True:
+            frame = await outbox.get()
             try:
-                await ws.send_text(message)
+                # JSON goes out as text frames: browsers deliver binary frames
+                # as Blobs, which would break JSON.parse(event.data)
+                if isinstance(frame, bytes):
+                    await websocket.send_bytes(frame)
+                else:
+                    await websocket.send_text(frame)
             except Exception:
-                stale.append(ws)
+                self.disconnect(user_id, websocket)
+                return
 
-        for ws in stale:
-            self.disconnect(user_id, ws)
+    @staticmethod
+    async def _close_quietly(websocket: WebSocket):
+        try:
+            await websocket.close(code=1013)
+        except Exception:
+            pass
 
 
-ws_manager = ConnectionManager()
+ws_manager = ConnectionManager(
+    settings.WS_MAX_CONNECTIONS_PER_USER,
+    coalesce_window=settings.WS_COALESCE_WINDOW_MS / 1000,
+    max_batch=settings.WS_MAX_BATCH,
+    send_queue_size=settings.WS_SEND_QUEUE_SIZE,
+)
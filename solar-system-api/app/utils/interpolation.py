@@ -2,10 +2,9 @@
 Interpolation utilities for smooth video transitions between snapshots.
 """
 
+import functools
 
-def lerp(start: float, end: float, t: float) -> float:
-    """Linear interpolation. t ranges from 0.0 to 1.0."""
-    return start + (end - start) * t
+import numpy as np
 
 
 def ease_in_out(t: float) -> float:
@@ -13,42 +12,114 @@ def ease_in_out(t: float) -> float:
     return t * t * (3 - 2 * t)
 
 
-def interpolate_snapshots(snapshot_a: dict, snapshot_b: dict, t: float) -> dict:
+def _static_fields(person: dict) -> tuple:
+    return person["id"], person["name"], person.get("tag")
+
+
+@functools.lru_cache(maxsize=16)
+def _eased_table(steps: int) -> np.ndarray:
+    """
+    ease_in_out(i / steps) for i in [0, steps). Videos use the same
+    transition length for every pair, so this is computed once and shared
+    (read-only).
     """
-    Creates an intermediate state between two snapshots at time t (0.0 to 1.0).
+    table = ease_in_out(np.arange(steps, dtype=np.float64) / steps)
+    table.setflags(write=False)
+    return table
+
+
+class SnapshotPair:
+    """
+    Two snapshots with their people matched by id, for interpolating any
+    number of t values without redoing the membership work.
 
     - People present in both: lerp their positions
     - People only in A (removed): fade them out (reduce alpha as t increases)
     - People only in B (added): fade them in (increase alpha as t increases)
+
+    Interpolated people carry only what the renderer reads (id, name, tag,
+    position and alpha). Building those few keys per step is much cheaper
+    than copying every field of the snapshot record, and keeps the frame
+    states small when they are pickled to render workers.
     """
-    eased_t = ease_in_out(t)
-
-    people_a = {p["id"]: p for p in snapshot_a.get("people", [])}
-    people_b = {p["id"]: p for p in snapshot_b.get("people", [])}
-
-    all_ids = set(people_a.keys()) | set(people_b.keys())
-
-    interpolated_people = []
-    for pid in all_ids:
-        if pid in people_a and pid in people_b:
-            # Present in both — lerp position
-            pa, pb = people_a[pid], people_b[pid]
-            interpolated_people.append(
-                {
-                    **pb,
-                    "x_position": lerp(pa["x_position"], pb["x_position"], eased_t),
-                    "y_position": lerp(pa["y_position"], pb["y_position"], eased_t),
-                    "alpha": 1.0,
-                }
-            )
-        elif pid in people_a:
-            # Removed — fade out
-            interpolated_people.append({**people_a[pid], "alpha": 1.0 - eased_t})
-        else:
-            # Added — fade in
-            interpolated_people.append({**people_b[pid], "alpha": eased_t})
-
-    return {
-        **snapshot_b,
-        "people": interpolated_people,
-    }
+
+    def __init__(self, snapshot_a: dict, snapshot_b: dict):
+        people_a = {p["id"]: p for p in snapshot_a.get("people", [])}
+        people_b = {p["id"]: p for p in snapshot_b.get("people", [])}
+
+        both = [pid for pid in people_a if pid in people_b]
+        self.snapshot_a = snapshot_a
+        self.snapshot_b = snapshot_b
+        # Static (id, name, tag) per person; only positions and alpha vary
+        self._moved = [_static_fields(people_b[pid]) for pid in both]
+        self._removed = [
+            (_static_fields(p), p["x_position"], p["y_position"])
+            for pid, p in people_a.items()
+            if pid not in people_b
+        ]
+        self._added = [
+            (_static_fields(p), p["x_position"], p["y_position"])
+            for pid, p in people_b.items()
+            if pid not in people_a
+        ]
+
+        # Parallel (len(both), 2) start/end positions for the matched people
+        self._xy_a = np.array(
+            [(people_a[pid]["x_position"], people_a[pid]["y_position"]) for pid in both],
+            dtype=np.float64,
+        ).reshape(-1, 2)
+        self._xy_b = np.array(
+            [(people_b[pid]["x_position"], people_b[pid]["y_position"]) for pid in both],
+            dtype=np.float64,
+        ).reshape(-1, 2)
+
+    def sequence(self, steps: int) -> list[dict]:
+        """All intermediate states for t = i / steps, i in [0, steps)."""
+        return self.interpolate_eased(_eased_table(steps))
+
+    def interpolate_eased(self, eased: np.ndarray) -> list[dict]:
+        """
+        Intermediate states for each already-eased t. Positions for every step
+        are one NumPy expression over the position arrays; dicts are only
+        built at the end, for the renderer.
+
+        At the endpoints (eased t of 0 or 1) nothing is mid-transition, so the
+        start or end snapshot itself is returned (shared, not copied).
+        """
+        if self.snapshot_a is self.snapshot_b:
+            return [self.snapshot_a] * len(eased)
+
+        weight = eased[:, None, None]
+        xy = (self._xy_a * (1.0 - weight) + self._xy_b * weight).tolist()
+
+        states = []
+        for step, eased_t in enumerate(eased.tolist()):
+            if eased_t <= 0.0:
+                states.append(self.snapshot_a)
+                continue
+            if eased_t >= 1.0:
+                states.append(self.snapshot_b)
+                continue
+
+            # Present in both — lerped position
+            interpolated_people = [
+                {"id": pid, "name": name, "tag": tag,
+                 "x_position": x, "y_position": y, "alpha": 1.0}
+                for (pid, name, tag), (x, y) in zip(self._moved, xy[step])
+            ]
+            # Removed — fade out; added — fade in
+            fade_out = 1.0 - eased_t
+            interpolated_people += [
+                {"id": pid, "name": name, "tag": tag,
+                 "x_position": x, "y_position": y, "alpha": fade_out}
+                for (pid, name, tag), x, y in self._removed
+            ]
+            interpolated_people += [
+                {"id": pid, "name": name, "tag": tag,
+                 "x_position": x, "y_position": y, "alpha": eased_t}
+                for (pid, name, tag), x, y in self._added
+            ]
+            states.append({**self.snapshot_b, "people": interpolated_people})
+
+        return states
+
@@ -1,9 +1,10 @@
-from sqlalchemy import select
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from app.database import async_session
 from app.models.tag import Tag
 
-PREDEFINED_TAGS = [
+PREDEFINED_TAGS = (
     {"name": "Partner", "color": "#FF6B6B", "icon": "\u2764\ufe0f"},
     {"name": "Family", "color": "#FFD93D", "icon": "\U0001f3e0"},
     {"name": "Close Friend", "color": "#4ECDC4", "icon": "\U0001f91d"},
@@ -11,27 +12,51 @@ PREDEFINED_TAGS = [
     {"name": "Colleague", "color": "#96CEB4", "icon": "\U0001f4bc"},
     {"name": "Mentor", "color": "#DDA0DD", "icon": "\U0001f31f"},
     {"name": "Acquaintance", "color": "#95A5A6", "icon": "\U0001f464"},
-]
+)
+
+# Seeder parameters, built once at import
+_SEED_NAMES: tuple[str, ...] = tuple(tag_data["name"] for tag_data in PREDEFINED_TAGS)
+_SEED_ROWS: tuple[dict, ...] = tuple(
+    {**tag_data, "is_predefined": True, "solar_system_id": None}
+    for tag_data in PREDEFINED_TAGS
+)
+
+# Set once this process has seen every predefined tag in the database
+_seeded = False
 
 
 async def seed_predefined_tags() -> None:
-    """Seed predefined tags if they don't already exist. Safe to call on every startup."""
+    """
+    Insert any missing predefined tags in one statement. Safe to call on every
+    startup, including from several workers at once: names that already exist
+    hit the unique ix_tags_predefined_name index and are skipped. Later calls
+    in the same process are no-ops.
+    """
+    global _seeded
+    if _seeded:
+        return
+
     async with async_session() as session:
-        result = await session.execute(
-            select(Tag).where(Tag.is_predefined == True)  # noqa: E712
+        # Normally everything is already seeded: a read-only count avoids the
+        # insert's row locks and WAL traffic
+        present = await session.scalar(
+            select(func.count())
+            .select_from(Tag)
+            .where(
+                Tag.is_predefined.is_(True),
+                Tag.name.in_(_SEED_NAMES),
+            )
         )
-        existing_tags = result.scalars().all()
-        existing_names = {t.name for t in existing_tags}
-
-        for tag_data in PREDEFINED_TAGS:
-            if tag_data["name"] not in existing_names:
-                tag = Tag(
-                    name=tag_data["name"],
-                    color=tag_data["color"],
-                    icon=tag_data["icon"],
-                    is_predefined=True,
-                    solar_system_id=None,
-                )
-                session.add(tag)
+        if present == len(_SEED_NAMES):
+            _seeded = True
+            return
 
+        await session.execute(
+            pg_insert(Tag)
+            .values(list(_SEED_ROWS))
+            .on_conflict_do_nothing(
+                index_elements=[Tag.name], index_where=Tag.is_predefined
+            )
+        )
         await session.commit()
+    _seeded = True
@@ -0,0 +1,31 @@
+"""
+Static file serving for generated images and videos.
+"""
+
+import os
+
+from starlette.responses import Response
+from starlette.staticfiles import PathLike, StaticFiles
+from starlette.types import Scope
+
+
+class ImmutableStaticFiles(StaticFiles):
+    """
+    StaticFiles that marks every served file as immutable.
+
+    Generated filenames embed a timestamp, so a given URL never changes
+    content and browsers/CDNs can cache it for a year.
+    """
+
+    cache_control = "public, max-age=31536000, immutable"
+
+    def file_response(
+        self,
+        full_path: PathLike,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        response.headers["Cache-Control"] = self.cache_control
+        return response
@@ -0,0 +1,45 @@
+"""Make people.distance_from_center a generated column
+
+Revision ID: 0001
+Revises:
+Create Date: 2025-01-20 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.drop_column("people", "distance_from_center")
+    op.add_column(
+        "people",
+        sa.Column(
+            "distance_from_center",
+            sa.Float(),
+            sa.Computed(
+                "sqrt(x_position * x_position + y_position * y_position)", persisted=True
+            ),
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("people", "distance_from_center")
+    op.add_column(
+        "people",
+        sa.Column("distance_from_center", sa.Float(), nullable=False, server_default="0.5"),
+    )
+    op.execute(
+        "UPDATE people SET distance_from_center = "
+        "sqrt(x_position * x_position + y_position * y_position)"
+    )
+    op.alter_column("people", "distance_from_center", server_default=None)
@@ -0,0 +1,31 @@
+"""Add partial index on active people per solar system
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2025-01-20 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_people_ss_active",
+        "people",
+        ["solar_system_id"],
+        postgresql_where=sa.text("removed_at IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_people_ss_active", table_name="people")
@@ -0,0 +1,38 @@
+"""Add composite index for newest-first snapshot history
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2025-01-20 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_snapshots_ss_created",
+            "snapshots",
+            ["solar_system_id", sa.text("created_at DESC")],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_snapshots_ss_created",
+            table_name="snapshots",
+            postgresql_concurrently=True,
+        )
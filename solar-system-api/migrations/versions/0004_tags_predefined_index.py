@@ -0,0 +1,31 @@
+"""Add partial index on predefined tags
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2025-01-20 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_tags_predefined",
+        "tags",
+        ["is_predefined"],
+        postgresql_where=sa.text("is_predefined"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_tags_predefined", table_name="tags")
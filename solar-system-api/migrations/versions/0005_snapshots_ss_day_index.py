@@ -0,0 +1,38 @@
+"""Add per-day expression index for snapshot activity
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2025-01-20 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_snapshots_ss_day",
+            "snapshots",
+            ["solar_system_id", sa.text("(CAST(timezone('UTC', created_at) AS DATE))")],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_snapshots_ss_day",
+            table_name="snapshots",
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,63 @@
+"""Make predefined tag names unique
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2025-01-20 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0006"
+down_revision: Union[str, None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Concurrent startups could race the old select-then-insert seeder into
+# duplicate predefined tags; keep the first row per name
+_DUPLICATES = """
+    SELECT id, first_value(id) OVER (PARTITION BY name ORDER BY id) AS keep_id
+    FROM tags
+    WHERE is_predefined
+"""
+
+
+def upgrade() -> None:
+    op.execute(
+        f"""
+        UPDATE people SET tag_id = dup.keep_id
+        FROM ({_DUPLICATES}) AS dup
+        WHERE people.tag_id = dup.id AND dup.id <> dup.keep_id
+        """
+    )
+    op.execute(
+        f"""
+        DELETE FROM tags
+        USING ({_DUPLICATES}) AS dup
+        WHERE tags.id = dup.id AND dup.id <> dup.keep_id
+        """
+    )
+
+    # Covers the is_predefined lookups as well, so it replaces the 0004 index
+    op.drop_index("ix_tags_predefined", table_name="tags")
+    op.create_index(
+        "ix_tags_predefined_name",
+        "tags",
+        ["name"],
+        unique=True,
+        postgresql_where=sa.text("is_predefined"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_tags_predefined_name", table_name="tags")
+    op.create_index(
+        "ix_tags_predefined",
+        "tags",
+        ["is_predefined"],
+        postgresql_where=sa.text("is_predefined"),
+    )